@@ -32,6 +32,7 @@ echo ============================================================
 echo Build concluido!
 echo ============================================================
 echo.
-echo O executavel esta em: dist\MarketAnalyzer.exe
+echo O executavel esta em: dist\MarketAnalyzer\MarketAnalyzer.exe
+echo Para distribuir, use: dist\MarketAnalyzer.zip
 echo.
 pause
@@ -9,6 +9,14 @@ import subprocess
 import shutil
 from pathlib import Path
 
+# Módulos excluídos do bundle para reduzir tamanho e tempo de extração.
+# Só entram módulos que nenhuma dependência importa em runtime: pydoc,
+# unittest, distutils e xml.* NÃO (pyarrow importa pydoc via pandas,
+# numpy.testing importa unittest).
+EXCLUDED_MODULES = (
+    'tkinter', 'lib2to3', 'test', 'numpy.tests', 'pandas.tests',
+)
+
 def build_exe():
     """Compila o programa usando PyInstaller"""
     
@@ -33,14 +41,17 @@ def build_exe():
     
     # Comando PyInstaller
     cmd = [
-        "pyinstaller",
+        sys.executable, "-m", "PyInstaller",
         "--name", exe_name,
-        "--onefile",
+        # Equivalente a python -OO: remove asserts e docstrings do bytecode
+        "--optimize", "2",
+        # --onedir: evita extrair o pacote para %TEMP% a cada execução
+        "--onedir",
         "--windowed",
         "--paths", str(current_dir),
         "--icon=icon.ico" if os.path.exists("icon.ico") else "",
+        "--splash=splash.png" if os.path.exists("splash.png") else "",
         "--add-data", "README.md;.",
-        "--hidden-import", "PyQt5",
         "--hidden-import", "PyQt5.QtWebEngineWidgets",
         "--hidden-import", "ccxt",
         "--hidden-import", "talib",
@@ -51,11 +62,17 @@ def build_exe():
         "--hidden-import", "market_analysis",
         "--hidden-import", "config_manager",
         "--hidden-import", "trading_bot",
+        # ccxt/__init__.py importa todas as exchanges: não há como incluir só algumas
         "--collect-all", "ccxt",
         "--collect-all", "talib",
-        "gui_main.py"
     ]
     
+    # Módulos que nunca são usados em runtime
+    for module in EXCLUDED_MODULES:
+        cmd += ["--exclude-module", module]
+    
+    cmd.append("gui_main.py")
+    
     # Remove strings vazias
     cmd = [c for c in cmd if c]
     
@@ -71,13 +88,17 @@ def build_exe():
         print("✓ Compilação concluída com sucesso!")
         print("=" * 60)
         
-        # Localização do executável
-        dist_dir = current_dir / "dist"
-        exe_path = dist_dir / f"{exe_name}.exe"
+        # Localização do executável (modo --onedir: dist/<nome>/<nome>.exe)
+        app_dir = current_dir / "dist" / exe_name
+        exe_path = app_dir / f"{exe_name}.exe"
         
         if exe_path.exists():
             print(f"\nExecutável criado em: {exe_path}")
-            print(f"Tamanho: {exe_path.stat().st_size / (1024*1024):.2f} MB")
+            
+            # Pacote .zip da pasta para distribuição
+            zip_path = shutil.make_archive(str(app_dir), "zip", root_dir=app_dir.parent, base_dir=exe_name)
+            print(f"Pacote para distribuição: {zip_path}")
+            print(f"Tamanho: {os.path.getsize(zip_path) / (1024*1024):.2f} MB")
         else:
             print("\n⚠ Executável não encontrado no diretório esperado")
         
@@ -118,19 +139,17 @@ def clean_build_files():
     """Remove arquivos temporários de build"""
     print("\nLimpando arquivos temporários...")
     
-    dirs_to_remove = ['build', '__pycache__']
-    files_to_remove = ['*.spec']
-    
-    for dir_name in dirs_to_remove:
-        if os.path.exists(dir_name):
-            shutil.rmtree(dir_name)
-            print(f"✓ Removido: {dir_name}/")
+    dirs_to_remove = {'build', '__pycache__'}
     
-    import glob
-    for pattern in files_to_remove:
-        for file in glob.glob(pattern):
-            os.remove(file)
-            print(f"✓ Removido: {file}")
+    # Uma única leitura do diretório em vez de exists() + glob por padrão
+    with os.scandir('.') as entries:
+        for entry in entries:
+            if entry.is_dir() and entry.name in dirs_to_remove:
+                shutil.rmtree(entry.path)
+                print(f"✓ Removido: {entry.name}/")
+            elif entry.is_file() and entry.name.endswith('.spec'):
+                os.remove(entry.path)
+                print(f"✓ Removido: {entry.name}")
 
 def main():
     """Função principal"""
@@ -147,8 +166,8 @@ def main():
         print("\n" + "=" * 60)
         print("BUILD CONCLUÍDO COM SUCESSO!")
         print("=" * 60)
-        print("\nO executável está em: dist/MarketAnalyzer.exe")
-        print("\nVocê pode distribuir este arquivo.")
+        print("\nO executável está em: dist/MarketAnalyzer/MarketAnalyzer.exe")
+        print("\nDistribua o arquivo dist/MarketAnalyzer.zip (pasta completa).")
     else:
         print("\n" + "=" * 60)
         print("BUILD FALHOU!")
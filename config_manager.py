@@ -5,20 +5,114 @@ Gerenciamento seguro de configurações e credenciais
 
 import json
 import os
-from typing import Dict, Any
+import copy
+import hashlib
+from typing import Dict, Any, Optional, TYPE_CHECKING
 from pathlib import Path
 import logging
-from cryptography.fernet import Fernet
 import base64
+import threading
+
+if TYPE_CHECKING:
+    # Importados sob demanda (reduz tempo de startup)
+    from cryptography.fernet import Fernet
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Flags inexistentes na plataforma viram 0 (O_NOFOLLOW não existe no Windows)
+_O_NOFOLLOW = getattr(os, 'O_NOFOLLOW', 0)
+_O_BINARY = getattr(os, 'O_BINARY', 0)
+
+# Campos armazenados criptografados
+_CREDENTIAL_FIELDS = ('api_key', 'api_secret')
+
+# Tokens Fernet (versão 0x80) sempre começam com este prefixo em base64 URL-safe
+_FERNET_TOKEN_PREFIX = b'gAAAAA'
+
+# Formato atual das credenciais: prefixo + base64 URL-safe de nonce(12) || ciphertext || tag(16)
+_GCM_TOKEN_PREFIX = 'gcm1:'
+_GCM_NONCE_SIZE = 12
+# Contexto HKDF: a chave AES-GCM é derivada, nunca a mesma usada pelo Fernet legado
+_GCM_KDF_INFO = b'market-analyzer/credentials/aes-256-gcm/v1'
+
+
+def _json_dumps(data: Dict[str, Any]) -> bytes:
+    """Serializa para JSON (UTF-8) usando orjson quando disponível"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _json_loads(raw: bytes) -> Dict[str, Any]:
+    """Desserializa JSON usando orjson quando disponível"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _atomic_write(path: Path, data: bytes) -> int:
+    """
+    Grava em arquivo temporário e troca com os.replace (atômico no mesmo
+    sistema de arquivos). Retorna o st_mtime_ns do arquivo gravado.
+    """
+    tmp = path.with_name(path.name + '.tmp')
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            mtime = os.fstat(f.fileno()).st_mtime_ns
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return mtime
+
 
 class ConfigManager:
     """
     Gerenciador de configurações com criptografia de credenciais
     """
     
+    # Ciphers AES-GCM por SHA-256 da chave, compartilhados no processo
+    _CIPHER_POOL: Dict[bytes, 'AESGCM'] = {}
+    
+    # Configuração padrão imutável (listas como tuplas)
+    _DEFAULT_CONFIG: Dict[str, Any] = {
+        'exchange': 'Binance',
+        'exchange_id': 'binance',
+        'api_key': '',
+        'api_secret': '',
+        'favorite_markets': (
+            'BTC/USDT',
+            'ETH/USDT',
+            'BNB/USDT',
+            'SOL/USDT',
+            'XRP/USDT'
+        ),
+        'stock_symbols': ('AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META'),
+        'forex_pairs': ('EUR/USD', 'GBP/USD', 'USD/JPY'),
+        'default_timeframe': '5m',
+        'auto_analysis_interval': 60,
+        'enable_trading': False,
+        'execute_via_browser': False,
+        'max_trades': 5,
+        'trade_amount': 100,
+        'stop_loss_percent': 2.0,
+        'take_profit_percent': 5.0,
+        'check_interval': 60,
+    }
+    
     def __init__(self, config_dir: str = None):
         """
         Inicializa o gerenciador de configurações
@@ -37,14 +131,37 @@ class ConfigManager:
         self.config_file = self.config_dir / 'config.json'
         self.key_file = self.config_dir / '.key'
         
+        self._key = b''
+        self._legacy_cipher = None
         self._ensure_key()
         self.cipher = self._load_cipher()
+        
+        # Leituras e gravações (caches, credenciais e config.json.tmp) são feitas
+        # na thread da GUI e na thread de escrita; reentrante porque a migração e
+        # update_config chamam save_config já com o lock
+        self._lock = threading.RLock()
+        
+        # Cache do JSON como está no disco (credenciais cifradas), invalidado pelo mtime
+        self._raw = None
+        self._cache_mtime = -1
+        # Versão descriptografada, montada só quando alguém precisa das credenciais
+        self._cache = None
+        # Texto plano -> texto cifrado das credenciais (o nonce é aleatório,
+        # então reaproveitar evita recriptografar a cada save)
+        self._cred_cache: Dict[str, str] = {}
     
     def _ensure_key(self):
         """Garante que existe uma chave de criptografia"""
         if not self.key_file.exists():
-            key = Fernet.generate_key()
-            with open(self.key_file, 'wb') as f:
+            # Mesmo formato do Fernet.generate_key(): 32 bytes aleatórios em base64 URL-safe
+            key = base64.urlsafe_b64encode(os.urandom(32))
+            # O_EXCL: não sobrescreve chave criada em paralelo; O_NOFOLLOW: recusa symlink
+            flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | _O_NOFOLLOW | _O_BINARY
+            try:
+                fd = os.open(self.key_file, flags, 0o600)
+            except FileExistsError:
+                return
+            with os.fdopen(fd, 'wb') as f:
                 f.write(key)
             
             # Torna o arquivo oculto no Windows
@@ -52,57 +169,109 @@ class ConfigManager:
                 import ctypes
                 ctypes.windll.kernel32.SetFileAttributesW(str(self.key_file), 2)
     
-    def _load_cipher(self) -> Fernet:
-        """Carrega cipher para criptografia"""
-        with open(self.key_file, 'rb') as f:
+    def _load_cipher(self) -> 'AESGCM':
+        """Carrega cipher para criptografia (reutilizado entre instâncias com a mesma chave)"""
+        fd = os.open(self.key_file, os.O_RDONLY | _O_NOFOLLOW | _O_BINARY)
+        with os.fdopen(fd, 'rb') as f:
             key = f.read()
-        return Fernet(key)
+        self._key = key
+        
+        digest = hashlib.sha256(key).digest()
+        pool = type(self)._CIPHER_POOL
+        cipher = pool.get(digest)
+        if cipher is None:
+            from cryptography.hazmat.primitives import hashes
+            from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+            from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+            
+            raw_key = base64.urlsafe_b64decode(key.strip())
+            aes_key = HKDF(
+                algorithm=hashes.SHA256(), length=32, salt=None, info=_GCM_KDF_INFO
+            ).derive(raw_key)
+            cipher = AESGCM(aes_key)
+            pool[digest] = cipher
+        return cipher
+    
+    def _get_legacy_cipher(self) -> 'Fernet':
+        """Fernet usado apenas para ler credenciais gravadas por versões antigas"""
+        if self._legacy_cipher is None:
+            from cryptography.fernet import Fernet
+            self._legacy_cipher = Fernet(self._key)
+        return self._legacy_cipher
     
     def _encrypt(self, data: str) -> str:
-        """Criptografa dados"""
+        """Criptografa dados (AES-256-GCM)"""
         if not data:
             return ''
-        encrypted = self.cipher.encrypt(data.encode())
-        return base64.b64encode(encrypted).decode()
+        nonce = os.urandom(_GCM_NONCE_SIZE)
+        ciphertext = self.cipher.encrypt(nonce, data.encode(), None)
+        return _GCM_TOKEN_PREFIX + base64.urlsafe_b64encode(nonce + ciphertext).decode('ascii')
+    
+    def _encrypt_cached(self, data: str) -> str:
+        """Criptografa reaproveitando o texto cifrado se o valor não mudou"""
+        encrypted = self._cred_cache.get(data)
+        if encrypted is None:
+            encrypted = self._encrypt(data)
+            self._cred_cache[data] = encrypted
+        return encrypted
     
     def _decrypt(self, data: str) -> str:
-        """Descriptografa dados"""
+        """Descriptografa dados (AES-GCM ou formatos Fernet antigos)"""
         if not data:
             return ''
         try:
-            decoded = base64.b64decode(data.encode())
-            decrypted = self.cipher.decrypt(decoded)
-            return decrypted.decode()
+            if data.startswith(_GCM_TOKEN_PREFIX):
+                blob = base64.urlsafe_b64decode(data[len(_GCM_TOKEN_PREFIX):])
+                nonce, ciphertext = blob[:_GCM_NONCE_SIZE], blob[_GCM_NONCE_SIZE:]
+                return self.cipher.decrypt(nonce, ciphertext, None).decode()
+            
+            token = data.encode('ascii')
+            if not token.startswith(_FERNET_TOKEN_PREFIX):
+                # Formato mais antigo: token Fernet embrulhado em base64 padrão
+                token = base64.b64decode(token)
+            return self._get_legacy_cipher().decrypt(token).decode()
         except Exception as e:
             logger.error(f"Erro ao descriptografar: {e}")
             return ''
     
-    def save_config(self, config: Dict[str, Any]):
+    def save_config(self, config: Dict[str, Any], force: bool = False):
         """
         Salva configurações
         
         Args:
             config: Dicionário com configurações
+            force: Grava mesmo se o conteúdo for igual ao do cache
         """
-        try:
-            # Criptografa credenciais sensíveis
-            safe_config = config.copy()
-            
-            if 'api_key' in safe_config and safe_config['api_key']:
-                safe_config['api_key'] = self._encrypt(safe_config['api_key'])
-            
-            if 'api_secret' in safe_config and safe_config['api_secret']:
-                safe_config['api_secret'] = self._encrypt(safe_config['api_secret'])
-            
-            # Salva em arquivo
-            with open(self.config_file, 'w') as f:
-                json.dump(safe_config, f, indent=4)
-            
-            logger.info("Configurações salvas com sucesso")
-            
-        except Exception as e:
-            logger.error(f"Erro ao salvar configurações: {e}")
-            raise
+        with self._lock:
+            try:
+                # Nada mudou desde a última leitura/gravação: evita serializar e fsync
+                if not force and self._cache is not None and config == self._cache and self._file_unchanged():
+                    return
+                
+                # Cópia profunda única: listas aninhadas (ex.: favorite_markets) não
+                # ficam compartilhadas com o dict do chamador, que pode alterá-lo depois
+                plain = copy.deepcopy(config)
+                
+                # Criptografa credenciais sensíveis
+                safe_config = dict(plain)
+                
+                for field in _CREDENTIAL_FIELDS:
+                    if field in safe_config and safe_config[field]:
+                        safe_config[field] = self._encrypt_cached(safe_config[field])
+                
+                # Salva em arquivo (atômico: um crash não deixa JSON truncado)
+                mtime = _atomic_write(self.config_file, _json_dumps(safe_config))
+                
+                # Atualiza caches (cifrado e em texto plano)
+                self._raw = safe_config
+                self._cache = plain
+                self._cache_mtime = mtime
+                
+                logger.info("Configurações salvas com sucesso")
+                
+            except Exception as e:
+                logger.error(f"Erro ao salvar configurações: {e}")
+                raise
     
     def load_config(self) -> Dict[str, Any]:
         """
@@ -111,54 +280,96 @@ class ConfigManager:
         Returns:
             Dicionário com configurações
         """
-        try:
-            if not self.config_file.exists():
-                # Retorna configuração padrão
+        with self._lock:
+            try:
+                config = self._read_config()
+                if config is None:
+                    # Retorna configuração padrão
+                    return self._get_default_config()
+                # Cópia profunda: quem chama pode alterar o dict sem poluir o cache
+                return copy.deepcopy(config)
+                
+            except Exception as e:
+                logger.error(f"Erro ao carregar configurações: {e}")
                 return self._get_default_config()
-            
-            with open(self.config_file, 'r') as f:
-                config = json.load(f)
-            
-            # Descriptografa credenciais
-            if 'api_key' in config and config['api_key']:
-                config['api_key'] = self._decrypt(config['api_key'])
-            
-            if 'api_secret' in config and config['api_secret']:
-                config['api_secret'] = self._decrypt(config['api_secret'])
-            
-            logger.info("Configurações carregadas com sucesso")
-            
-            return config
-            
-        except Exception as e:
-            logger.error(f"Erro ao carregar configurações: {e}")
-            return self._get_default_config()
+    
+    def _file_unchanged(self) -> bool:
+        """True se o arquivo no disco ainda é o refletido nos caches (mesmo mtime)"""
+        try:
+            return os.stat(self.config_file).st_mtime_ns == self._cache_mtime
+        except FileNotFoundError:
+            return False
+    
+    def _read_raw(self) -> Optional[Dict[str, Any]]:
+        """
+        Retorna o JSON do disco (credenciais ainda cifradas), relendo o arquivo
+        apenas quando o mtime mudou. Retorna None se o arquivo não existe.
+        Não copia: o chamador não deve alterar o resultado.
+        """
+        try:
+            mtime = os.stat(self.config_file).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        
+        # Arquivo não mudou desde a última leitura: evita reparsear o JSON
+        if self._raw is not None and mtime == self._cache_mtime:
+            return self._raw
+        
+        with open(self.config_file, 'rb') as f:
+            self._raw = _json_loads(f.read())
+        self._cache_mtime = mtime
+        self._cache = None
+        
+        logger.info("Configurações carregadas com sucesso")
+        
+        return self._raw
+    
+    def _read_config(self) -> Optional[Dict[str, Any]]:
+        """
+        Retorna o dict com credenciais descriptografadas, descriptografando
+        apenas uma vez por versão do arquivo. Retorna None se o arquivo não existe.
+        Não copia: o chamador não deve alterar o resultado.
+        """
+        raw = self._read_raw()
+        if raw is None:
+            return None
+        if self._cache is not None:
+            return self._cache
+        
+        config = dict(raw)
+        
+        # Descriptografa credenciais
+        needs_migration = False
+        for field in _CREDENTIAL_FIELDS:
+            if field in config and config[field]:
+                encrypted = config[field]
+                config[field] = self._decrypt(encrypted)
+                if not config[field]:
+                    continue
+                if encrypted.startswith(_GCM_TOKEN_PREFIX):
+                    self._cred_cache[config[field]] = encrypted
+                else:
+                    needs_migration = True
+        
+        self._cache = config
+        
+        if needs_migration:
+            # Migração única: regrava credenciais Fernet como AES-GCM
+            # (force: o dict é o próprio cache, o atalho de "sem mudanças" pularia a gravação)
+            try:
+                self.save_config(config, force=True)
+                logger.info("Credenciais migradas para AES-GCM")
+            except Exception as e:
+                logger.warning(f"Não foi possível migrar credenciais: {e}")
+            return self._cache
+        
+        return config
     
     def _get_default_config(self) -> Dict[str, Any]:
-        """Retorna configuração padrão"""
+        """Retorna configuração padrão (nova cópia, com listas mutáveis)"""
         return {
-            'exchange': 'Binance',
-            'exchange_id': 'binance',
-            'api_key': '',
-            'api_secret': '',
-            'favorite_markets': [
-                'BTC/USDT',
-                'ETH/USDT',
-                'BNB/USDT',
-                'SOL/USDT',
-                'XRP/USDT'
-            ],
-            'stock_symbols': ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META'],
-            'forex_pairs': ['EUR/USD', 'GBP/USD', 'USD/JPY'],
-            'default_timeframe': '5m',
-            'auto_analysis_interval': 60,
-            'enable_trading': False,
-            'execute_via_browser': False,
-            'max_trades': 5,
-            'trade_amount': 100,
-            'stop_loss_percent': 2.0,
-            'take_profit_percent': 5.0,
-            'check_interval': 60,
+            key: list(value) if isinstance(value, tuple) else value
+            for key, value in self._DEFAULT_CONFIG.items()
         }
     
     def get_config_value(self, key: str, default: Any = None) -> Any:
@@ -172,8 +383,19 @@ class ConfigManager:
         Returns:
             Valor da configuração
         """
-        config = self.load_config()
-        return config.get(key, default)
+        with self._lock:
+            try:
+                # Só descriptografa se a chave pedida for uma credencial
+                if key in _CREDENTIAL_FIELDS:
+                    config = self._read_config()
+                else:
+                    config = self._read_raw()
+            except Exception as e:
+                logger.error(f"Erro ao carregar configurações: {e}")
+                config = None
+            if config is None:
+                config = self._get_default_config()
+            return copy.deepcopy(config.get(key, default))
     
     def set_config_value(self, key: str, value: Any):
         """
@@ -183,16 +405,23 @@ class ConfigManager:
             key: Chave da configuração
             value: Valor a definir
         """
-        config = self.load_config()
-        config[key] = value
-        self.save_config(config)
+        self.update_config({key: value})
+    
+    def update_config(self, updates: Dict[str, Any]):
+        """
+        Aplica várias alterações com uma única leitura e uma única escrita
+        
+        Args:
+            updates: Dicionário com as chaves/valores a definir
+        """
+        with self._lock:
+            config = self.load_config()
+            config.update(updates)
+            self.save_config(config)
     
     def clear_credentials(self):
         """Remove credenciais armazenadas"""
-        config = self.load_config()
-        config['api_key'] = ''
-        config['api_secret'] = ''
-        self.save_config(config)
+        self.update_config({'api_key': '', 'api_secret': ''})
         logger.info("Credenciais removidas")
     
     def export_config(self, export_path: str):
@@ -202,22 +431,23 @@ class ConfigManager:
         Args:
             export_path: Caminho do arquivo de exportação
         """
-        try:
-            config = self.load_config()
-            
-            # Remove credenciais sensíveis
-            export_config = config.copy()
-            export_config['api_key'] = ''
-            export_config['api_secret'] = ''
-            
-            with open(export_path, 'w') as f:
-                json.dump(export_config, f, indent=4)
-            
-            logger.info(f"Configurações exportadas para {export_path}")
-            
-        except Exception as e:
-            logger.error(f"Erro ao exportar configurações: {e}")
-            raise
+        with self._lock:
+            try:
+                # Credenciais são descartadas: não precisa descriptografar
+                raw = self._read_raw()
+                export_config = dict(raw) if raw is not None else self._get_default_config()
+                
+                # Remove credenciais sensíveis
+                for field in _CREDENTIAL_FIELDS:
+                    export_config[field] = ''
+                
+                _atomic_write(Path(export_path), _json_dumps(export_config))
+                
+                logger.info(f"Configurações exportadas para {export_path}")
+                
+            except Exception as e:
+                logger.error(f"Erro ao exportar configurações: {e}")
+                raise
     
     def import_config(self, import_path: str):
         """
@@ -226,19 +456,20 @@ class ConfigManager:
         Args:
             import_path: Caminho do arquivo de importação
         """
-        try:
-            with open(import_path, 'r') as f:
-                config = json.load(f)
-            
-            # Mantém credenciais existentes
-            current_config = self.load_config()
-            config['api_key'] = current_config.get('api_key', '')
-            config['api_secret'] = current_config.get('api_secret', '')
-            
-            self.save_config(config)
-            
-            logger.info(f"Configurações importadas de {import_path}")
-            
-        except Exception as e:
-            logger.error(f"Erro ao importar configurações: {e}")
-            raise
+        with self._lock:
+            try:
+                with open(import_path, 'rb') as f:
+                    config = _json_loads(f.read())
+                
+                # Mantém credenciais existentes (lidas do cache, sem cópia)
+                current_config = self._read_config() or {}
+                for field in _CREDENTIAL_FIELDS:
+                    config[field] = current_config.get(field, '')
+                
+                self.save_config(config)
+                
+                logger.info(f"Configurações importadas de {import_path}")
+                
+            except Exception as e:
+                logger.error(f"Erro ao importar configurações: {e}")
+                raise
@@ -6,11 +6,21 @@ Suporta: criptomoedas (CCXT), ações e forex (Yahoo Finance).
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Mapping, Optional, Tuple
+from types import MappingProxyType
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import asyncio
+import json
 import logging
+import os
+import re
+import sys
 import threading
-import ccxt
+import time
 
 try:
     import yfinance as yf
@@ -18,19 +28,110 @@ try:
 except ImportError:
     YFINANCE_AVAILABLE = False
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Endpoint de gráficos do Yahoo Finance (o mesmo usado internamente pelo yfinance)
+YF_CHART_URL = 'https://query1.finance.yahoo.com/v8/finance/chart/{ticker}'
+YF_HTTP_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'}
+# Máximo de conexões simultâneas ao Yahoo (limite do conector da sessão)
+YF_MAX_CONCURRENCY = 8
+# Colunas usadas pelo ticker Yahoo (esquema fixo, posições 0-3)
+_YF_TICKER_COLS = ('high', 'low', 'close', 'volume')
+
+# Cache de OHLCV: entradas em memória (LRU) e parquet em disco por (exchange, símbolo, timeframe)
+OHLCV_MEMORY_CACHE_SIZE = 64
+OHLCV_DISK_CACHE_DIR = Path.home() / '.cache' / 'marketanalyser'
+OHLCV_DISK_CACHE_MAX_ROWS = 5000
+# Lista de mercados ativos persistida entre execuções (JSON em OHLCV_DISK_CACHE_DIR/<exchange>)
+MARKETS_DISK_CACHE_TTL = 6 * 3600
+# Máximo de threads em get_ohlcv_many
+OHLCV_MAX_WORKERS = 8
+
+# Sanitização de candles: valores não finitos (inf) viram NaN.
+# Sem fastmath: ele assume ausência de NaN/inf e anularia o teste.
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _sanitize_ohlcv(arr):
+        for i in range(arr.shape[0]):
+            for j in range(arr.shape[1]):
+                if not np.isfinite(arr[i, j]):
+                    arr[i, j] = np.nan
+        return arr
+else:
+    def _sanitize_ohlcv(arr):
+        arr[~np.isfinite(arr)] = np.nan
+        return arr
+
+# Duração de cada timeframe em milissegundos
+_TF_MS = {
+    '1m': 60_000,
+    '5m': 300_000,
+    '15m': 900_000,
+    '30m': 1_800_000,
+    '1h': 3_600_000,
+    '4h': 14_400_000,
+    '1d': 86_400_000,
+    '1w': 604_800_000,
+}
+
+# Classes de exchange do ccxt resolvidas neste processo (id -> classe)
+_EXCHANGE_CLASSES: Dict[str, type] = {}
+_EXCHANGE_CLASSES_LOCK = threading.Lock()
+
+
+def _get_exchange_class(ccxt_module, exchange_id: str) -> Optional[type]:
+    """Classe da exchange via ccxt.exchanges, resolvida uma vez por processo (None se inexistente)."""
+    with _EXCHANGE_CLASSES_LOCK:
+        if not _EXCHANGE_CLASSES:
+            _EXCHANGE_CLASSES.update(
+                (name, getattr(ccxt_module, name)) for name in ccxt_module.exchanges
+            )
+        return _EXCHANGE_CLASSES.get(exchange_id)
+
 # Tipos de ativo suportados
 ASSET_TYPE_CRYPTO = 'crypto'
 ASSET_TYPE_STOCK = 'stock'
 ASSET_TYPE_FOREX = 'forex'
 
+# Forex: base de até 4 caracteres e quote fiat conhecida (ex: EUR/USD, GBP/JPY)
+_FOREX_RE = re.compile(r'^([^/]{0,4})/(?:USD|EUR|GBP|JPY|CHF|AUD|CAD)$')
+# Bases cripto que casam com o padrão forex (ex: BTC/USD)
+_CRYPTO_BASES = frozenset({'BTC', 'ETH'})
+
 
 class DataProvider:
     """
     Provedor de dados de mercado de múltiplas fontes
     """
     
+    # Atributos fixos de instância (sem __dict__ por instância)
+    __slots__ = (
+        'exchange_name', 'api_key', 'api_secret', 'dtype', 'exchange', '_ccxt',
+        '_exchange_lock', '_io_loop', '_io_thread', '_io_loop_lock',
+        '_yf_session', '_yf_session_loop',
+        '_markets_lock', '_symbol_locks', '_symbol_locks_guard', '_ohlcv_cache_lock',
+        '_markets_cache', '_markets_cache_ts', '_markets_ttl', '_active_symbols', '_markets_disk_expiry',
+        '_markets_sorted', '_markets_upper', '_market_categories', '_ohlcv_cache',
+    )
+    
     SUPPORTED_EXCHANGES = {
         'binance': 'Binance',
         'binanceusdm': 'Binance Futures (USDT-M)',
@@ -75,8 +176,25 @@ class DataProvider:
         '1d': '1d',
         '1w': '1wk',
     }
+
+    # Intervalo yfinance -> período máximo permitido (1m só permite ~7 dias)
+    YF_PERIOD_MAP = {
+        '1m': '7d',
+        '5m': '60d',
+        '15m': '60d',
+        '30m': '60d',
+        '1h': '730d',
+        '1d': 'max',
+        '1wk': 'max',
+    }
     
-    def __init__(self, exchange_name: str = 'binance', api_key: str = None, api_secret: str = None):
+    def __init__(
+        self,
+        exchange_name: str = 'binance',
+        api_key: str = None,
+        api_secret: str = None,
+        dtype=np.float32,
+    ):
         """
         Inicializa o provedor de dados
         
@@ -84,53 +202,96 @@ class DataProvider:
             exchange_name: Nome da exchange (binance, coinbase, etc)
             api_key: API key (opcional para dados públicos)
             api_secret: API secret (opcional para dados públicos)
+            dtype: Tipo das colunas OHLCV retornadas (float32 usa metade da
+                memória; passe np.float64 para precisão total ou
+                'float32[pyarrow]' para colunas Arrow, repassadas sem cópia
+                a parquet/Polars). O índice de timestamps continua datetime64.
         """
         self.exchange_name = exchange_name.lower()
         self.api_key = api_key
         self.api_secret = api_secret
+        self.dtype = dtype
         self.exchange = None
-        self._lock = threading.Lock()
+        self._ccxt = None
+        # O cliente CCXT síncrono (sessão requests, rate limiter) não é thread-safe:
+        # toda chamada de rede nele passa por este lock (GUI, ticker e bot)
+        self._exchange_lock = threading.Lock()
+        # Event loop dedicado (thread daemon) para as buscas assíncronas (Yahoo)
+        self._io_loop = None
+        self._io_thread = None
+        self._io_loop_lock = threading.Lock()
+        # Sessão HTTP compartilhada para o Yahoo (keep-alive entre chamadas)
+        self._yf_session = None
+        self._yf_session_loop = None
+        # Lock só para a memoização de mercados; buscas OHLCV usam locks por símbolo
+        self._markets_lock = threading.Lock()
+        self._symbol_locks: Dict[str, threading.Lock] = {}
+        self._symbol_locks_guard = threading.Lock()
+        self._ohlcv_cache_lock = threading.Lock()
+        
+        # Cache de mercados (load_markets baixa e parseia vários MB de JSON)
+        self._markets_cache = None
+        self._markets_cache_ts = 0.0
+        self._markets_ttl = 3600
+        self._active_symbols = None
+        # Validade (time.monotonic) da lista de mercados lida do cache em disco
+        self._markets_disk_expiry = 0.0
+        # Índice de busca (arrays numpy) montado por carga de mercados
+        self._markets_sorted = None
+        self._markets_upper = None
+        self._market_categories = None
+        
+        # Cache LRU de OHLCV: (exchange, símbolo, timeframe) -> (fim do candle atual, limit, DataFrame)
+        self._ohlcv_cache = OrderedDict()
         
         self._init_exchange()
     
     def _init_exchange(self):
         """Inicializa a conexão com a exchange usando CCXT"""
         try:
-            if not hasattr(ccxt, self.exchange_name):
+            # Import tardio: o ccxt carrega centenas de módulos de exchanges
+            import ccxt
+            self._ccxt = ccxt
+            
+            exchange_class = _get_exchange_class(ccxt, self.exchange_name)
+            if exchange_class is None:
                 raise ValueError(
                     f"Exchange '{self.exchange_name}' não encontrada no CCXT. "
-                    f"IDs válidos incluem: {', '.join(sorted(DataProvider.SUPPORTED_EXCHANGES.keys()))}"
+                    f"IDs válidos incluem: {_SUPPORTED_SORTED}"
                 )
-            exchange_class = getattr(ccxt, self.exchange_name)
 
-            config = {
-                'enableRateLimit': True,
-                'timeout': 30000,
-                'rateLimit': 200,
-            }
-
-            # Configurações específicas para Binance (spot estável, evita 429)
-            if self.exchange_name == 'binance':
-                config['options'] = {
-                    'defaultType': 'spot',
-                    'adjustForTimeDifference': True,
-                }
-                config['rateLimit'] = 100
-            elif self.exchange_name == 'binanceusdm':
-                config['options'] = {'defaultType': 'future'}
-                config['rateLimit'] = 100
-
-            if self.api_key and self.api_secret:
-                config['apiKey'] = self.api_key
-                config['secret'] = self.api_secret
-
-            self.exchange = exchange_class(config)
+            self.exchange = exchange_class(self._build_exchange_config())
             logger.info(f"Exchange {self.exchange_name} inicializada com sucesso")
 
         except Exception as e:
             logger.error(f"Erro ao inicializar exchange {self.exchange_name}: {e}")
             raise
     
+    def _build_exchange_config(self) -> Dict:
+        """Monta a configuração do cliente CCXT"""
+        config = {
+            'enableRateLimit': True,
+            'timeout': 30000,
+            'rateLimit': 200,
+        }
+
+        # Configurações específicas para Binance (spot estável, evita 429)
+        if self.exchange_name == 'binance':
+            config['options'] = {
+                'defaultType': 'spot',
+                'adjustForTimeDifference': True,
+            }
+            config['rateLimit'] = 100
+        elif self.exchange_name == 'binanceusdm':
+            config['options'] = {'defaultType': 'future'}
+            config['rateLimit'] = 100
+
+        if self.api_key and self.api_secret:
+            config['apiKey'] = self.api_key
+            config['secret'] = self.api_secret
+
+        return config
+    
     def get_available_markets(self) -> List[str]:
         """
         Retorna lista de mercados disponíveis na exchange
@@ -138,30 +299,107 @@ class DataProvider:
         Returns:
             Lista de símbolos de mercado (ex: ['BTC/USDT', 'ETH/USDT'])
         """
-        with self._lock:
-            return self._get_available_markets_unsafe()
+        with self._markets_lock:
+            # Cópia: a lista interna é memoizada e não deve ser alterada
+            return list(self._get_available_markets_unsafe())
+
+    def _get_markets(self) -> Dict[str, Dict]:
+        """
+        Retorna o dict de mercados da exchange, recarregando apenas
+        quando o cache expira (TTL de self._markets_ttl segundos).
+        """
+        now = time.monotonic()
+        if self._markets_cache is None or now - self._markets_cache_ts >= self._markets_ttl:
+            # O CCXT guarda os mercados após a 1ª carga; após o TTL força o reload
+            with self._exchange_lock:
+                self._markets_cache = self.exchange.load_markets(reload=self._markets_cache is not None)
+            self._markets_cache_ts = now
+            self._active_symbols = None
+            self._markets_sorted = None
+            self._markets_upper = None
+            self._market_categories = None
+        return self._markets_cache
 
     def _get_available_markets_unsafe(self) -> List[str]:
         try:
             if not self.exchange:
                 return []
             
-            markets = self.exchange.load_markets()
-            symbols = list(markets.keys())
+            if self._markets_cache is None:
+                # Partida a frio: usa a lista do disco sem consultar a exchange enquanto válida
+                now = time.monotonic()
+                if self._active_symbols is None:
+                    cached = self._load_cached_markets()
+                    if cached is not None:
+                        symbols, age = cached
+                        self._set_active_symbols(symbols)
+                        self._markets_disk_expiry = now + MARKETS_DISK_CACHE_TTL - age
+                if self._active_symbols is not None and now < self._markets_disk_expiry:
+                    return self._active_symbols
             
-            # Filtra apenas mercados ativos
-            active_symbols = [
-                symbol for symbol in symbols 
-                if markets[symbol].get('active', True)
-            ]
+            markets = self._get_markets()
+            if self._active_symbols is None:
+                # Filtra apenas mercados ativos (ordenado uma vez por carga de mercados)
+                active = [market['symbol'] for market in markets.values() if market.get('active', True)]
+                active.sort()
+                self._set_active_symbols(active)
+                self._save_cached_markets(active)
             
-            return sorted(active_symbols)
+            return self._active_symbols
             
         except Exception as e:
             logger.error(f"Erro ao obter mercados: {e}")
             return []
     
+    def _set_active_symbols(self, symbols: List[str]):
+        """Define a lista de mercados ativos e monta o índice de busca junto"""
+        self._active_symbols = symbols
+        self._markets_sorted = np.array(symbols, dtype=str)
+        self._markets_upper = np.char.upper(self._markets_sorted)
+        self._market_categories = None
+    
+    def _markets_cache_path(self) -> Path:
+        """Arquivo JSON com a lista de mercados ativos desta exchange"""
+        return OHLCV_DISK_CACHE_DIR / self.exchange_name / 'markets.json'
+    
+    def _load_cached_markets(self) -> Optional[Tuple[List[str], float]]:
+        """Lê a lista de mercados do disco: (símbolos, idade em s) ou None se ausente/expirada"""
+        path = self._markets_cache_path()
+        try:
+            age = time.time() - path.stat().st_mtime
+            if not 0 <= age < MARKETS_DISK_CACHE_TTL:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                symbols = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Cache de mercados ilegível em {path}: {e}")
+            return None
+        if not isinstance(symbols, list) or not symbols:
+            return None
+        return symbols, age
+    
+    def _save_cached_markets(self, symbols: List[str]):
+        """Grava a lista de mercados no disco de forma atômica (arquivo temporário + os.replace)"""
+        if not symbols:
+            return
+        path = self._markets_cache_path()
+        tmp_path = path.with_name(path.name + '.tmp')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(symbols, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Não foi possível gravar cache de mercados em {path}: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+    
     @staticmethod
+    @functools.lru_cache(maxsize=512)
     def detect_asset_type(symbol: str) -> str:
         """
         Detecta o tipo de ativo pelo formato do símbolo.
@@ -170,15 +408,30 @@ class DataProvider:
         - Caso contrário assume crypto
         """
         s = symbol.strip().upper()
-        if '/' in s:
-            base, quote = s.split('/', 1)
-            # Forex: pares com USD, EUR, GBP, JPY (3-4 letras)
-            forex_quotes = ('USD', 'EUR', 'GBP', 'JPY', 'CHF', 'AUD', 'CAD')
-            if len(base) <= 4 and len(quote) <= 4 and quote in forex_quotes and base != 'BTC' and base != 'ETH':
-                return ASSET_TYPE_FOREX
-            return ASSET_TYPE_CRYPTO
-        # Símbolo único = ação (ex: AAPL, MSFT)
-        return ASSET_TYPE_STOCK
+        m = _FOREX_RE.match(s)
+        if m and m.group(1) not in _CRYPTO_BASES:
+            return ASSET_TYPE_FOREX
+        # Símbolo sem '/' = ação (ex: AAPL, MSFT)
+        return ASSET_TYPE_CRYPTO if '/' in s else ASSET_TYPE_STOCK
+
+    @staticmethod
+    def classify_many(symbols) -> np.ndarray:
+        """
+        Versão vetorizada de detect_asset_type para muitos símbolos
+        (ex: filtros da interface sobre todos os mercados).
+        
+        Returns:
+            Array com o tipo de ativo de cada símbolo, na mesma ordem
+        """
+        s = pd.Series(symbols, dtype=object).str.strip().str.upper()
+        base = s.str.extract(_FOREX_RE, expand=False)
+        forex = base.notna() & ~base.isin(_CRYPTO_BASES)
+        has_slash = s.str.contains('/', regex=False)
+        return np.select(
+            [forex.to_numpy(), has_slash.to_numpy(dtype=bool)],
+            [ASSET_TYPE_FOREX, ASSET_TYPE_CRYPTO],
+            default=ASSET_TYPE_STOCK,
+        )
 
     @staticmethod
     def symbol_to_yf_ticker(symbol: str, asset_type: str) -> str:
@@ -200,36 +453,145 @@ class DataProvider:
     ) -> Optional[pd.DataFrame]:
         """
         Obtém dados OHLCV de ações ou forex via Yahoo Finance.
+        Usa o endpoint de gráficos diretamente (aiohttp); o yfinance fica
+        como alternativa quando o aiohttp não está instalado ou a busca falha.
         """
-        if not YFINANCE_AVAILABLE:
-            logger.error("yfinance não instalado. Use: pip install yfinance")
-            return None
         asset_type = asset_type or self.detect_asset_type(symbol)
         if asset_type == ASSET_TYPE_CRYPTO:
             logger.warning("Use get_ohlcv_data para crypto (CCXT)")
             return None
         ticker = self.symbol_to_yf_ticker(symbol, asset_type)
         interval = self.YF_INTERVAL_MAP.get(timeframe, '1d')
-        # yfinance 1m só permite ~7 dias; ajustar period
-        period_map = {'1m': '7d', '5m': '60d', '15m': '60d', '30m': '60d', '1h': '730d', '1d': 'max', '1wk': 'max'}
-        period = period_map.get(interval, '60d')
+        period = self.YF_PERIOD_MAP.get(interval, '60d')
+
+        if AIOHTTP_AVAILABLE:
+            try:
+                df = self._fetch_yf_chart(ticker, interval, period)
+                if df is not None and len(df) > 0:
+                    # Cópia própria (não uma fatia): quem chama pode gravar colunas nela
+                    df = df.iloc[-limit:].copy()
+                    logger.info(f"Dados Yahoo obtidos para {symbol} ({ticker}): {len(df)} candles")
+                    return df
+                logger.warning(f"Nenhum dado Yahoo para {ticker}")
+            except Exception as e:
+                logger.warning(f"Erro no endpoint Yahoo para {symbol}: {e}")
+
+        return self._get_ohlcv_yfinance(symbol, ticker, interval, period, limit)
+
+    def _get_ohlcv_yfinance(
+        self,
+        symbol: str,
+        ticker: str,
+        interval: str,
+        period: str,
+        limit: int,
+    ) -> Optional[pd.DataFrame]:
+        """OHLCV via biblioteca yfinance (caminho alternativo)."""
+        if not YFINANCE_AVAILABLE:
+            logger.error("yfinance não instalado. Use: pip install yfinance")
+            return None
         try:
             obj = yf.Ticker(ticker)
             df = obj.history(period=period, interval=interval, auto_adjust=True)
             if df is None or len(df) == 0:
                 logger.warning(f"Nenhum dado yfinance para {ticker}")
                 return None
-            df = df.rename(columns={'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Volume': 'volume'})
-            df = df[['open', 'high', 'low', 'close', 'volume']].copy()
-            df['volume'] = df['volume'].fillna(0)
+            # Um único DataFrame a partir dos arrays (sem rename/subset/copy/fillna intermediários)
+            cols = ('Open', 'High', 'Low', 'Close', 'Volume')
+            arrs = [df[c].to_numpy(dtype=np.float64) for c in cols]
+            arrs[4] = np.nan_to_num(arrs[4], nan=0.0)
+            df = pd.DataFrame({c.lower(): a for c, a in zip(cols, arrs)}, index=df.index, dtype=self.dtype)
             df.index.name = 'timestamp'
-            df = df.tail(limit)
+            df = df.iloc[-limit:].copy()
             logger.info(f"Dados yfinance obtidos para {symbol} ({ticker}): {len(df)} candles")
             return df
         except Exception as e:
             logger.error(f"Erro yfinance para {symbol}: {e}")
             return None
 
+    @staticmethod
+    def _yf_chart_to_dataframe(payload: Dict, dtype=np.float64) -> Optional[pd.DataFrame]:
+        """Converte a resposta JSON do endpoint de gráficos do Yahoo em DataFrame OHLCV."""
+        results = (payload.get('chart') or {}).get('result') or []
+        if not results:
+            return None
+        result = results[0]
+        timestamps = result.get('timestamp')
+        if not timestamps:
+            return None
+
+        indicators = result['indicators']
+        quote = indicators['quote'][0]
+        # Um único array OHLCV pré-alocado (None -> NaN na conversão para float64)
+        arr = np.empty((len(timestamps), 5), dtype=np.float64)
+        for i, col in enumerate(('open', 'high', 'low', 'close', 'volume')):
+            values = quote.get(col)
+            arr[:, i] = np.asarray(values, dtype=np.float64) if values else np.nan
+
+        # Equivalente ao auto_adjust=True do yfinance (ajuste por dividendos/splits)
+        adjclose = indicators.get('adjclose')
+        if adjclose and adjclose[0].get('adjclose'):
+            ratio = np.asarray(adjclose[0]['adjclose'], dtype=np.float64) / arr[:, 3]
+            arr[:, :4] *= ratio[:, None]
+
+        # Descarta candles sem preço (ex: candle em formação sem negociação)
+        valid = ~np.isnan(arr[:, 3])
+        if not valid.all():
+            arr = arr[valid]
+        np.nan_to_num(arr[:, 4], copy=False)
+
+        ts = np.asarray(timestamps, dtype='i8')[valid] * 1_000_000_000
+        # dtype no construtor: aceita dtypes numpy e do pandas (ex: 'float32[pyarrow]')
+        return pd.DataFrame(
+            arr,
+            index=pd.DatetimeIndex(ts, name='timestamp'),
+            columns=['open', 'high', 'low', 'close', 'volume'],
+            dtype=dtype,
+        )
+
+    async def _fetch_yf_chart_async(
+        self,
+        session: 'aiohttp.ClientSession',
+        ticker: str,
+        interval: str,
+        period: str,
+    ) -> Optional[pd.DataFrame]:
+        """Busca um ticker no endpoint de gráficos do Yahoo."""
+        async with session.get(
+            YF_CHART_URL.format(ticker=ticker),
+            params={'interval': interval, 'range': period},
+        ) as resp:
+            resp.raise_for_status()
+            payload = await resp.json(content_type=None)
+        return self._yf_chart_to_dataframe(payload, self.dtype)
+
+    def _get_yf_session(self) -> 'aiohttp.ClientSession':
+        """
+        Sessão HTTP do Yahoo, criada uma vez e reutilizada (conexões keep-alive,
+        sem novo handshake TLS por chamada). Só é usada no event loop dedicado
+        (todas as buscas passam por _run_async) e fechada por close().
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._io_loop:
+            # Recriar a sessão em outro loop vazaria o conector da anterior
+            raise RuntimeError("Sessão Yahoo usada fora do event loop dedicado")
+        if self._yf_session is None or self._yf_session.closed:
+            self._yf_session = aiohttp.ClientSession(
+                headers=YF_HTTP_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(limit_per_host=YF_MAX_CONCURRENCY, keepalive_timeout=60),
+            )
+            self._yf_session_loop = loop
+        return self._yf_session
+
+    def _fetch_yf_chart(self, ticker: str, interval: str, period: str) -> Optional[pd.DataFrame]:
+        """Versão síncrona de _fetch_yf_chart_async para um único ticker."""
+        async def run():
+            return await self._fetch_yf_chart_async(
+                self._get_yf_session(), ticker, interval, period
+            )
+        return self._run_async(run())
+
     def get_ohlcv_data(
         self, 
         symbol: str, 
@@ -250,65 +612,283 @@ class DataProvider:
         Returns:
             DataFrame com colunas: timestamp, open, high, low, close, volume
         """
-        with self._lock:
-            atype = asset_type or self.detect_asset_type(symbol)
+        atype = asset_type or self.detect_asset_type(symbol)
+        # Serializa apenas buscas do mesmo símbolo (protege o cache parquet dele)
+        with self._symbol_lock(symbol):
             if atype == ASSET_TYPE_CRYPTO:
                 return self._get_ohlcv_ccxt(symbol, timeframe, limit)
             return self.get_ohlcv_data_yf(symbol, timeframe, limit, atype)
 
+    def _symbol_lock(self, symbol: str) -> threading.Lock:
+        """Lock dedicado a um símbolo (criado na primeira utilização)."""
+        with self._symbol_locks_guard:
+            lock = self._symbol_locks.get(symbol)
+            if lock is None:
+                lock = self._symbol_locks[symbol] = threading.Lock()
+            return lock
+
+    def get_ohlcv_many(
+        self,
+        symbols: List[str],
+        timeframe: str = '5m',
+        limit: int = 500,
+    ) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Obtém OHLCV de vários símbolos em paralelo (threads). Único ponto de
+        busca em lote: cada símbolo passa por get_ohlcv_data (cache em memória,
+        parquet, cauda incremental e lock por símbolo).
+        
+        Args:
+            symbols: Lista de símbolos (ex: ['BTC/USDT', 'AAPL', 'EUR/USD'])
+            timeframe: Timeframe dos candles
+            limit: Número de candles por símbolo
+            
+        Returns:
+            Dicionário símbolo -> DataFrame (None quando a busca falhou)
+        """
+        if not symbols:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(OHLCV_MAX_WORKERS, len(symbols))) as pool:
+            futures = {
+                symbol: pool.submit(self.get_ohlcv_data, symbol, timeframe, limit)
+                for symbol in symbols
+            }
+            return {symbol: future.result() for symbol, future in futures.items()}
+
     def _get_ohlcv_ccxt(
         self,
         symbol: str,
         timeframe: str = '5m',
         limit: int = 500,
     ) -> Optional[pd.DataFrame]:
-        """Obtém OHLCV de cripto via exchange CCXT."""
+        """
+        Obtém OHLCV de cripto via exchange CCXT.
+        Usa cache em memória válido até o fechamento do candle atual e,
+        se disponível, cache parquet em disco (baixa só os candles faltantes).
+        """
         try:
             if not self.exchange:
                 logger.error("Exchange não inicializada")
                 return None
             
-            ohlcv = self.exchange.fetch_ohlcv(
-                symbol=symbol,
-                timeframe=timeframe,
-                limit=limit
-            )
+            tf_ms = _TF_MS.get(timeframe) or self.exchange.parse_timeframe(timeframe) * 1000
+            now_ms = self.exchange.milliseconds()
+            # A entrada vale até o fechamento do candle atual
+            bucket_end = (now_ms // tf_ms + 1) * tf_ms
+            key = (self.exchange_name, symbol, timeframe)
             
-            if not ohlcv:
-                logger.warning(f"Nenhum dado retornado para {symbol}")
+            with self._ohlcv_cache_lock:
+                entry = self._ohlcv_cache.get(key)
+                if entry is not None:
+                    self._ohlcv_cache.move_to_end(key)
+            if entry is not None and entry[0] == bucket_end and entry[1] >= limit:
+                logger.debug(f"cache_hit (memória) {symbol} {timeframe}")
+                return entry[2].iloc[-limit:].copy()
+            logger.debug(f"cache_miss (memória) {symbol} {timeframe}")
+            
+            # Entrada expirada ainda serve de base para baixar só a cauda
+            base = entry[2] if entry is not None else None
+            df = self._fetch_ohlcv_incremental(symbol, timeframe, limit, tf_ms, now_ms, base)
+            if df is None:
                 return None
             
-            df = pd.DataFrame(
-                ohlcv,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-            )
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+            with self._ohlcv_cache_lock:
+                self._ohlcv_cache[key] = (bucket_end, limit, df)
+                self._ohlcv_cache.move_to_end(key)
+                while len(self._ohlcv_cache) > OHLCV_MEMORY_CACHE_SIZE:
+                    self._ohlcv_cache.popitem(last=False)
+            
+            df = df.iloc[-limit:].copy()
             logger.info(f"Dados obtidos para {symbol}: {len(df)} candles")
             return df
         except Exception as e:
             logger.error(f"Erro ao obter dados OHLCV para {symbol}: {e}")
             return None
+
+    def _fetch_ohlcv_incremental(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        tf_ms: int,
+        now_ms: int,
+        base: Optional[pd.DataFrame] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Baixa OHLCV aproveitando o histórico já obtido (base em memória ou
+        parquet em disco): se ele cobre o pedido, busca apenas a cauda a partir
+        do último candle salvo (que é rebaixado, pois pode ter sido salvo
+        ainda em formação).
+        """
+        path = self._ohlcv_cache_path(symbol, timeframe)
+        stored = base if base is not None else self._read_ohlcv_parquet(path)
+        
+        df = None
+        if stored is not None and len(stored) >= limit:
+            last_ms = stored.index[-1].value // 1_000_000
+            missing = int((now_ms - last_ms) // tf_ms) + 1
+            if missing <= limit:
+                logger.debug(f"cache_hit (cauda) {symbol} {timeframe}: {missing} candles faltantes")
+                with self._exchange_lock:
+                    ohlcv = self.exchange.fetch_ohlcv(
+                        symbol=symbol,
+                        timeframe=timeframe,
+                        since=int(last_ms),
+                        limit=max(2, missing)
+                    )
+                df = stored
+                if ohlcv:
+                    df = pd.concat([stored, self._ohlcv_to_dataframe(ohlcv, self.dtype)])
+                    df = df[~df.index.duplicated(keep='last')]
+                # Parquet gravado com outro dtype (ex: versão anterior em float64)
+                df = df.astype(self.dtype, copy=False)
+        
+        if df is None:
+            logger.debug(f"cache_miss (cauda) {symbol} {timeframe}")
+            with self._exchange_lock:
+                ohlcv = self.exchange.fetch_ohlcv(
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    limit=limit
+                )
+            if not ohlcv:
+                logger.warning(f"Nenhum dado retornado para {symbol}")
+                return None
+            # Histórico antigo não contíguo é descartado
+            df = self._ohlcv_to_dataframe(ohlcv, self.dtype)
+        
+        self._write_ohlcv_parquet(path, df.iloc[-OHLCV_DISK_CACHE_MAX_ROWS:])
+        # Só os candles pedidos seguem para o cache em memória: a cauda anexada
+        # não acumula a cada chamada (cópia libera o buffer do concat)
+        return df.iloc[-min(limit, OHLCV_DISK_CACHE_MAX_ROWS):].copy()
+
+    def _ohlcv_cache_path(self, symbol: str, timeframe: str) -> Path:
+        """Arquivo parquet do cache em disco para (exchange, símbolo, timeframe)."""
+        symbol_safe = symbol.replace('/', '_').replace(':', '_')
+        return OHLCV_DISK_CACHE_DIR / self.exchange_name / symbol_safe / f"{timeframe}.parquet"
+
+    @staticmethod
+    def _read_ohlcv_parquet(path: Path) -> Optional[pd.DataFrame]:
+        """Lê o cache parquet (None se ausente, ilegível ou sem pyarrow)."""
+        if not PARQUET_AVAILABLE or not path.exists():
+            return None
+        try:
+            # memory_map: buffers numéricos lidos do arquivo mapeado, sem cópia intermediária
+            return pq.read_table(path, memory_map=True).to_pandas()
+        except Exception as e:
+            logger.warning(f"Cache OHLCV ilegível em {path}: {e}")
+            return None
+
+    @staticmethod
+    def _write_ohlcv_parquet(path: Path, df: pd.DataFrame):
+        """Grava o cache parquet de forma atômica (arquivo temporário + os.replace)."""
+        if not PARQUET_AVAILABLE:
+            return
+        tmp_path = path.with_name(path.name + '.tmp')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(tmp_path, engine='pyarrow')
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Não foi possível gravar cache OHLCV em {path}: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+    
+    @staticmethod
+    def _ohlcv_to_dataframe(ohlcv: List[List], dtype=np.float64) -> pd.DataFrame:
+        """Converte a lista de candles do CCXT em DataFrame indexado por timestamp."""
+        # Conversão única para float64 (None -> NaN, como o antigo errors='coerce')
+        arr = _sanitize_ohlcv(np.asarray(ohlcv, dtype=np.float64))
+        ts = arr[:, 0].astype('i8') * 1_000_000
+        return pd.DataFrame(
+            arr[:, 1:],
+            index=pd.DatetimeIndex(ts, name='timestamp'),
+            columns=['open', 'high', 'low', 'close', 'volume'],
+            dtype=dtype,
+        )
+
+    def _ensure_io_loop(self) -> asyncio.AbstractEventLoop:
+        """Retorna o event loop dedicado, iniciando sua thread na primeira chamada."""
+        with self._io_loop_lock:
+            if self._io_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='DataProviderIO', daemon=True)
+                thread.start()
+                self._io_loop = loop
+                self._io_thread = thread
+            return self._io_loop
+
+    def _run_async(self, coro, timeout: Optional[float] = None):
+        """
+        Executa a corrotina no event loop dedicado e espera o resultado.
+        Funciona de qualquer thread, exceto da própria thread do loop.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_io_loop()).result(timeout)
+
+    async def close_async(self):
+        """Fecha a sessão do Yahoo (chamar no mesmo event loop)"""
+        if self._yf_session is not None:
+            await self._yf_session.close()
+            self._yf_session = None
+            self._yf_session_loop = None
+
+    def close(self):
+        """
+        Fecha a sessão assíncrona e encerra o event loop dedicado.
+        Deve ser chamado por quem criou o provedor (__del__ não fecha as sessões).
+        """
+        with self._io_loop_lock:
+            loop, thread = self._io_loop, self._io_thread
+            self._io_loop = None
+            self._io_thread = None
+        if loop is None:
+            return
+        if self._yf_session_loop is loop:
+            try:
+                asyncio.run_coroutine_threadsafe(self.close_async(), loop).result(10)
+            except Exception as e:
+                logger.warning(f"Erro ao fechar sessão assíncrona: {e}")
+            # O loop será encerrado: a sessão não pode ser reaproveitada num loop novo
+            self._yf_session = None
+            self._yf_session_loop = None
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        if not thread.is_alive():
+            loop.close()
+
+    def __del__(self):
+        # Não bloqueia: no encerramento do interpretador a thread do loop já não
+        # roda e esperar close_async só estouraria o timeout. Quem cria o
+        # provedor deve chamar close() explicitamente.
+        if sys.is_finalizing():
+            return
+        loop = getattr(self, '_io_loop', None)
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(loop.stop)
+            except Exception:
+                pass
     
     def get_ticker(self, symbol: str, asset_type: str = None) -> Optional[Dict]:
         """
         Obtém informações de ticker (preço atual, volume, etc).
         Suporta crypto (CCXT) e ações/forex (Yahoo Finance).
         """
-        with self._lock:
-            atype = asset_type or self.detect_asset_type(symbol)
-            if atype == ASSET_TYPE_CRYPTO:
-                return self._get_ticker_ccxt(symbol)
-            return self._get_ticker_yf(symbol, atype)
+        atype = asset_type or self.detect_asset_type(symbol)
+        if atype == ASSET_TYPE_CRYPTO:
+            return self._get_ticker_ccxt(symbol)
+        return self._get_ticker_yf(symbol, atype)
 
     def _get_ticker_ccxt(self, symbol: str) -> Optional[Dict]:
         """Ticker de cripto via exchange."""
         try:
             if not self.exchange:
                 return None
-            ticker = self.exchange.fetch_ticker(symbol)
+            with self._exchange_lock:
+                ticker = self.exchange.fetch_ticker(symbol)
             return {
                 'symbol': symbol,
                 'last': ticker.get('last'),
@@ -326,28 +906,43 @@ class DataProvider:
             return None
 
     def _get_ticker_yf(self, symbol: str, asset_type: str) -> Optional[Dict]:
-        """Ticker de ação/forex via Yahoo Finance."""
+        """Ticker de ação/forex via Yahoo Finance (últimos 5 dias, candles diários)."""
+        ticker = self.symbol_to_yf_ticker(symbol, asset_type)
+        hist = None
+        if AIOHTTP_AVAILABLE:
+            try:
+                hist = self._fetch_yf_chart(ticker, '1d', '5d')
+            except Exception as e:
+                logger.warning(f"Erro no endpoint Yahoo para ticker {symbol}: {e}")
+        if hist is None or len(hist) == 0:
+            hist = self._get_ticker_history_yfinance(symbol, ticker)
+        if hist is None or len(hist) == 0:
+            return None
+        # Extrai as colunas uma vez e reduz direto no array (nanmax/nanmin = max/min do pandas).
+        # reindex: coluna de volume ausente vira NaN, sem teste de presença
+        arr = hist.reindex(columns=_YF_TICKER_COLS).to_numpy(dtype=np.float64)
+        return {
+            'symbol': symbol,
+            'last': float(arr[-1, 2]),
+            'bid': None,
+            'ask': None,
+            'high': float(np.nanmax(arr[:, 0])),
+            'low': float(np.nanmin(arr[:, 1])),
+            'volume': float(np.nan_to_num(arr[-1, 3])),
+            'change': None,
+            'percentage': None,
+            'timestamp': None,
+        }
+
+    def _get_ticker_history_yfinance(self, symbol: str, ticker: str) -> Optional[pd.DataFrame]:
+        """Histórico de 5 dias via yfinance, com colunas em minúsculas (caminho alternativo)."""
         if not YFINANCE_AVAILABLE:
             return None
         try:
-            ticker = self.symbol_to_yf_ticker(symbol, asset_type)
-            obj = yf.Ticker(ticker)
-            hist = obj.history(period='5d')
-            if hist is not None and len(hist) > 0:
-                last = float(hist['Close'].iloc[-1])
-                return {
-                    'symbol': symbol,
-                    'last': last,
-                    'bid': None,
-                    'ask': None,
-                    'high': float(hist['High'].max()),
-                    'low': float(hist['Low'].min()),
-                    'volume': float(hist['Volume'].iloc[-1]) if 'Volume' in hist.columns else 0,
-                    'change': None,
-                    'percentage': None,
-                    'timestamp': None,
-                }
-            return None
+            hist = yf.Ticker(ticker).history(period='5d')
+            if hist is None or len(hist) == 0:
+                return None
+            return hist.rename(columns={'High': 'high', 'Low': 'low', 'Close': 'close', 'Volume': 'volume'})
         except Exception as e:
             logger.error(f"Erro ao obter ticker yfinance para {symbol}: {e}")
             return None
@@ -363,16 +958,16 @@ class DataProvider:
             Lista de símbolos correspondentes
         """
         try:
-            markets = self.get_available_markets()
-            query_upper = query.upper()
-            
-            # Filtra símbolos que contêm a query
-            matching = [
-                symbol for symbol in markets 
-                if query_upper in symbol.upper()
-            ]
+            with self._markets_lock:
+                self._get_available_markets_unsafe()
+                if self._markets_upper is None:
+                    return []
+                sorted_arr = self._markets_sorted
+                upper_arr = self._markets_upper
             
-            return matching
+            # Busca vetorizada: símbolos que contêm a query
+            mask = np.char.find(upper_arr, query.upper()) >= 0
+            return sorted_arr[mask].tolist()
             
         except Exception as e:
             logger.error(f"Erro ao buscar símbolos: {e}")
@@ -386,43 +981,56 @@ class DataProvider:
             Dicionário com categorias e seus símbolos
         """
         try:
-            markets = self.get_available_markets()
-            
-            categories = {
-                'USDT': [],
-                'BTC': [],
-                'ETH': [],
-                'USD': [],
-                'EUR': [],
-                'Other': []
-            }
+            with self._markets_lock:
+                markets = self._get_available_markets_unsafe()
+                if self._market_categories is None:
+                    self._market_categories = self._categorize_markets(markets)
+                categories = self._market_categories
             
-            for symbol in markets:
-                if '/USDT' in symbol:
-                    categories['USDT'].append(symbol)
-                elif '/BTC' in symbol:
-                    categories['BTC'].append(symbol)
-                elif '/ETH' in symbol:
-                    categories['ETH'].append(symbol)
-                elif '/USD' in symbol:
-                    categories['USD'].append(symbol)
-                elif '/EUR' in symbol:
-                    categories['EUR'].append(symbol)
-                else:
-                    categories['Other'].append(symbol)
-            
-            return categories
+            # Cópia: o agrupamento interno é memoizado por carga de mercados
+            return {name: list(symbols) for name, symbols in categories.items()}
             
         except Exception as e:
             logger.error(f"Erro ao categorizar mercados: {e}")
             return {}
     
     @staticmethod
-    def get_supported_exchanges() -> Dict[str, str]:
-        """Retorna dicionário de exchanges suportadas"""
-        return DataProvider.SUPPORTED_EXCHANGES.copy()
+    def _categorize_markets(markets: List[str]) -> Dict[str, List[str]]:
+        """Agrupa os símbolos pela quote com um único groupby."""
+        categories = {
+            'USDT': [],
+            'BTC': [],
+            'ETH': [],
+            'USD': [],
+            'EUR': [],
+            'Other': []
+        }
+        if not markets:
+            return categories
+        
+        # Classificação vetorizada: quote exata (ignora o settle de derivativos, ex: BTC/USDT:USDT)
+        symbols = pd.Series(markets, dtype=object)
+        quote = symbols.str.rpartition('/')[2].str.partition(':')[0]
+        category = quote.where(quote.isin(list(categories)), 'Other')
+        
+        values = symbols.to_numpy()
+        for name, positions in symbols.groupby(category.to_numpy(), sort=False).indices.items():
+            categories[name] = values[positions].tolist()
+        return categories
     
     @staticmethod
-    def get_supported_timeframes() -> Dict[str, str]:
-        """Retorna dicionário de timeframes suportados"""
-        return DataProvider.TIMEFRAMES.copy()
+    def get_supported_exchanges() -> Mapping[str, str]:
+        """Retorna exchanges suportadas (visão somente leitura; use dict() para copiar)"""
+        return _EXCHANGES_VIEW
+    
+    @staticmethod
+    def get_supported_timeframes() -> Mapping[str, str]:
+        """Retorna timeframes suportados (visão somente leitura; use dict() para copiar)"""
+        return _TIMEFRAMES_VIEW
+
+
+# Visões somente leitura criadas uma vez (sem cópia a cada chamada)
+_EXCHANGES_VIEW = MappingProxyType(DataProvider.SUPPORTED_EXCHANGES)
+_TIMEFRAMES_VIEW = MappingProxyType(DataProvider.TIMEFRAMES)
+# Lista de IDs para mensagens de erro (ordenada uma vez)
+_SUPPORTED_SORTED = ', '.join(sorted(DataProvider.SUPPORTED_EXCHANGES))
@@ -6,6 +6,12 @@ Interface gráfica principal do Market Analyzer
 import sys
 import os
 import json
+import copy
+import functools
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 import logging
@@ -24,11 +30,13 @@ from PyQt5.QtWidgets import (
     QLabel, QPushButton, QComboBox, QLineEdit, QTextEdit, QTabWidget,
     QTableWidget, QTableWidgetItem, QGroupBox, QCheckBox, QSpinBox,
     QMessageBox, QProgressBar, QListWidget, QListWidgetItem, QSplitter, QFrame,
-    QDateTimeEdit, QTimeEdit
+    QDateTimeEdit, QTimeEdit, QCompleter
+)
+from PyQt5.QtCore import (
+    Qt, QEvent, QTimer, QObject, QRunnable, QThreadPool, QSemaphore, QSignalBlocker, QStringListModel, pyqtSignal, QDateTime, QTime, QUrl, QElapsedTimer
 )
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QDateTime, QTime, QUrl
 from PyQt5.QtGui import QFont, QColor, QPalette
-from PyQt5.QtWebEngineWidgets import QWebEngineView
+# QtWebEngineWidgets é importado sob demanda em _ensure_browser (DLLs do Chromium só no primeiro uso)
 
 from data_provider import DataProvider, ASSET_TYPE_CRYPTO, ASSET_TYPE_STOCK, ASSET_TYPE_FOREX
 from market_analysis import MarketAnalyzer
@@ -43,24 +51,236 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class AnalysisThread(QThread):
-    """Thread para análise de mercado em background"""
+# Duração de cada timeframe em segundos (agendamento da análise automática)
+_TIMEFRAME_SECS = {
+    '1m': 60, '5m': 300, '15m': 900, '30m': 1800,
+    '1h': 3600, '4h': 14400, '1d': 86400, '1w': 604800,
+}
+# Candles semanais fecham na segunda 00:00 UTC (a época Unix foi numa quinta)
+_TIMEFRAME_OFFSET_SECS = {'1w': 4 * 86400}
+
+
+def _secs_to_next_close(timeframe: str, now: Optional[float] = None) -> float:
+    """Segundos até o fechamento do próximo candle do timeframe (UTC)"""
+    step = _TIMEFRAME_SECS.get(timeframe, 60)
+    now = time.time() if now is None else now
+    return step - ((now - _TIMEFRAME_OFFSET_SECS.get(timeframe, 0)) % step)
+
+
+def _format_hms(total_secs: int) -> str:
+    """Segundos inteiros -> HH:MM:SS"""
+    minutes, seconds = divmod(total_secs, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+# Estilo da aplicação (aplicado uma vez no QApplication em main())
+_APP_QSS = """
+    QMainWindow {
+        background-color: #f5f5f5;
+    }
+    QGroupBox {
+        font-weight: bold;
+        border: 2px solid #cccccc;
+        border-radius: 5px;
+        margin-top: 10px;
+        padding-top: 10px;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px 0 5px;
+    }
+    QPushButton {
+        padding: 8px 15px;
+        border-radius: 4px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        opacity: 0.8;
+    }
+    QPushButton#success {
+        background-color: #4CAF50;
+        color: white;
+    }
+    QPushButton#primary {
+        background-color: #2196F3;
+        color: white;
+    }
+    QPushButton#danger {
+        background-color: #f44336;
+        color: white;
+    }
+"""
+
+
+@contextmanager
+def _bulk_update(widget):
+    """Suspende repaint e sinais do widget durante alterações em lote (um único repaint no fim)"""
+    widget.setUpdatesEnabled(False)
+    # QSignalBlocker restaura o estado anterior (seguro em blocos aninhados)
+    blocker = QSignalBlocker(widget)
+    try:
+        yield widget
+    finally:
+        blocker.unblock()
+        widget.setUpdatesEnabled(True)
+        widget.update()
+
+
+@functools.lru_cache(maxsize=None)
+def _exchange_name_to_id() -> Dict[str, str]:
+    """Nome exibido -> ID ccxt das exchanges suportadas (montado uma vez)"""
+    return {name: eid for eid, name in DataProvider.get_supported_exchanges().items()}
+
+
+# Texto do rótulo de confiança (ex.: 72.5%)
+_format_confidence = "{:.1f}%".format
+
+# Atalhos da aba do navegador (rótulo, endereço)
+QUICK_LINKS = (
+    ("TradingView", "https://www.tradingview.com"),
+    ("Binance", "https://www.binance.com"),
+    ("Coinbase", "https://www.coinbase.com"),
+    ("Kraken", "https://www.kraken.com"),
+    ("Bybit", "https://www.bybit.com"),
+    ("OKX", "https://www.okx.com"),
+    ("Bitget", "https://www.bitget.com"),
+)
+
+# Cor do rótulo de direção da análise
+_DIRECTION_COLORS = {
+    'UP': "#4CAF50",       # Verde
+    'DOWN': "#f44336",     # Vermelho
+    'NEUTRAL': "#FF9800",  # Laranja
+}
+
+# Cor do rótulo de status do bot (ativo / parado)
+_BOT_STATUS_COLORS = {
+    True: "#4CAF50",   # Verde
+    False: "#f44336",  # Vermelho
+}
+
+# Cache HTTP em disco do navegador embutido (JS/CSS das páginas de trade entre execuções)
+BROWSER_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'marketanalyser', 'webcache')
+BROWSER_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+# Página de trade de cripto por exchange ({pair}: BTC_USDT, {pair_lower}: btc/usdt)
+CRYPTO_URL_TEMPLATES = {
+    'binance': "https://www.binance.com/en/trade/{pair}",
+    'binanceusdm': "https://www.binance.com/en/futures/{pair}",
+    'bybit': "https://www.bybit.com/trade/usdt/{pair}",
+    'okx': "https://www.okx.com/trade-spot/{pair_lower}",
+    'kraken': "https://www.kraken.com/charts",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _crypto_url_template(exchange_id: str) -> str:
+    """Template da página de trade para o ID da exchange (resolvido uma vez por ID)"""
+    exchange_id = exchange_id.lower()
+    if exchange_id in CRYPTO_URL_TEMPLATES:
+        return CRYPTO_URL_TEMPLATES[exchange_id]
+    # Variantes (ex.: binancecoinm) caem no template da exchange base
+    for base_id, template in CRYPTO_URL_TEMPLATES.items():
+        if base_id in exchange_id:
+            return template
+    return CRYPTO_URL_TEMPLATES['binance']
+
+
+# JavaScript para tentar definir símbolo e quantidade na Binance (estrutura pode mudar).
+# Montado uma vez; o seletor CSS com flag "i" já filtra os campos em uma única passada.
+_INJECT_ORDER_JS = """
+(function(sym, amt) {
+    var inputs = document.querySelectorAll('input[placeholder*="amount" i], input[placeholder*="quantidade" i]');
+    for (var i = 0; i < inputs.length; i++) {
+        inputs[i].value = amt;
+        inputs[i].dispatchEvent(new Event('input', { bubbles: true }));
+    }
+    return 'Tentativa de preenchimento: ' + sym + ' qtd ' + amt;
+})(%s, %s);
+"""
+
+
+# Texto do painel de detalhes da análise (preenchido com format_map)
+_DETAILS_TEMPLATE = """
+=== ANÁLISE COMPLETA ===
+Decisão: {decision}
+Força do Sinal: {signal_strength}
+
+Preço Atual: ${current_price:.2f}
+
+--- INDICADORES ---
+RSI: {rsi_value:.2f} - {rsi_signal}
+MACD: {macd_value:.4f} - {macd_signal}
+ADX: {adx_value:.2f} - Tendência {trend_strength}
+Bollinger Bands: {bb_signal}
+EMA: {ema_signal}
+MFI: {mfi_signal}
+
+--- SINAIS ---
+Sinais de Compra: {buy_signals}
+Sinais de Venda: {sell_signals}
+
+Timestamp: {timestamp}
+"""
+_DETAILS_DEFAULTS = {
+    'decision': 'N/A', 'signal_strength': 'N/A', 'current_price': 0,
+    'rsi_value': 0, 'rsi_signal': 'N/A', 'macd_value': 0, 'macd_signal': 'N/A',
+    'adx_value': 0, 'trend_strength': 'N/A', 'bb_signal': 'N/A',
+    'ema_signal': 'N/A', 'mfi_signal': 'N/A', 'buy_signals': 0, 'sell_signals': 0,
+}
+
+
+# Busca do ticker em paralelo ao OHLCV/indicadores da análise (threads reaproveitadas)
+_TICKER_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='AnalysisTicker')
+
+
+# Gravação da configuração em disco (um worker: gravações saem na ordem em que foram pedidas)
+_CONFIG_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ConfigWriter')
+
+
+# Fechamento de provedores substituídos (close() espera sessões e a thread do loop)
+_PROVIDER_CLOSER = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ProviderClose')
+
+
+class AnalysisSignals(QObject):
+    """Sinais da tarefa de análise (QRunnable não é QObject)"""
     
-    analysis_complete = pyqtSignal(dict)
+    # object: o dict atravessa a fila de eventos por referência (dict viraria QVariantMap)
+    analysis_complete = pyqtSignal(object)
+    # Último candle igual ao já analisado: nada a recalcular
+    analysis_skipped = pyqtSignal()
     error_occurred = pyqtSignal(str)
+
+
+class AnalysisTask(QRunnable):
+    """Tarefa de análise de mercado executada no pool de threads"""
     
-    def __init__(self, data_provider, analyzer, symbol, timeframe):
+    def __init__(self, data_provider, analyzer, symbol, timeframe, asset_type=None, skip_candle_ts=None):
         super().__init__()
+        # Tempo de vida controlado pelo Python (a GUI guarda a referência até o sinal)
+        self.setAutoDelete(False)
+        self.signals = AnalysisSignals()
         self.data_provider = data_provider
         self.analyzer = analyzer
         self.symbol = symbol
         self.timeframe = timeframe
+        # Tipo de ativo resolvido na thread da GUI (evita reclassificar no worker)
+        self.asset_type = asset_type or DataProvider.detect_asset_type(symbol)
+        # Timestamp do último candle já analisado (None: sempre analisa) e do candle obtido
+        self.skip_candle_ts = skip_candle_ts
+        self.candle_ts = None
         self.running = True
     
     def run(self):
         """Executa análise (funciona para crypto, ações e forex em paralelo ao bot)."""
         try:
-            asset_type = DataProvider.detect_asset_type(self.symbol)
+            asset_type = self.asset_type
+            # Ticker em paralelo: as latências de rede se sobrepõem
+            ticker_future = _TICKER_EXECUTOR.submit(
+                self.data_provider.get_ticker, self.symbol, asset_type=asset_type
+            )
             df = self.data_provider.get_ohlcv_data(
                 self.symbol,
                 self.timeframe,
@@ -69,61 +289,220 @@ class AnalysisThread(QThread):
             )
             
             if df is None or len(df) == 0:
-                self.error_occurred.emit(f"Não foi possível obter dados para {self.symbol}")
+                ticker_future.cancel()
+                self.signals.error_occurred.emit(f"Não foi possível obter dados para {self.symbol}")
+                return
+            
+            self.candle_ts = df.index[-1]
+            if self.skip_candle_ts is not None and self.candle_ts == self.skip_candle_ts:
+                ticker_future.cancel()
+                self.signals.analysis_skipped.emit()
                 return
             
-            df = self.analyzer.populate_indicators(df)
+            # O DataProvider já devolve uma cópia própria: dispensa a segunda cópia
+            df = self.analyzer.populate_indicators(df, inplace=True)
             prediction = self.analyzer.predict_direction(df)
             
-            ticker = self.data_provider.get_ticker(self.symbol, asset_type=asset_type)
+            ticker = ticker_future.result()
             if ticker:
                 prediction['ticker'] = ticker
             
-            self.analysis_complete.emit(prediction)
+            # Texto do painel formatado aqui, fora da thread da GUI
+            prediction['details_text'] = _DETAILS_TEMPLATE.format_map(
+                {**_DETAILS_DEFAULTS, **prediction.get('details', {}), 'timestamp': prediction.get('timestamp', '')}
+            )
+            
+            self.signals.analysis_complete.emit(prediction)
             
         except Exception as e:
             logger.error(f"Erro na análise: {e}")
-            self.error_occurred.emit(str(e))
+            self.signals.error_occurred.emit(str(e))
     
     def stop(self):
-        """Para a thread"""
+        """Para a tarefa"""
         self.running = False
 
 
+class ProviderSignals(QObject):
+    """Sinais da inicialização do provedor de dados"""
+    
+    # (provider, mercados disponíveis)
+    provider_ready = pyqtSignal(object, list)
+    error_occurred = pyqtSignal(str)
+
+
+class ProviderInitTask(QRunnable):
+    """Cria o DataProvider e carrega os mercados fora da thread da GUI"""
+    
+    def __init__(self, exchange_id, api_key=None, api_secret=None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = ProviderSignals()
+        self.exchange_id = exchange_id
+        self.api_key = api_key
+        self.api_secret = api_secret
+    
+    def run(self):
+        """Conecta à exchange e busca a lista de mercados (rede)"""
+        try:
+            provider = DataProvider(
+                exchange_name=self.exchange_id,
+                api_key=self.api_key,
+                api_secret=self.api_secret
+            )
+            markets = provider.get_available_markets()
+            self.signals.provider_ready.emit(provider, markets)
+        except Exception as e:
+            logger.error(f"Erro ao inicializar data provider: {e}")
+            self.signals.error_occurred.emit(str(e))
+
+
+class AnalyzerSignals(QObject):
+    """Sinais da criação do analisador"""
+    
+    analyzer_ready = pyqtSignal(object)
+    error_occurred = pyqtSignal(str)
+
+
+class AnalyzerInitTask(QRunnable):
+    """Cria o MarketAnalyzer fora da thread da GUI"""
+    
+    def __init__(self):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = AnalyzerSignals()
+    
+    def run(self):
+        """Constrói o analisador (instância única, compartilhada com o TradingBot)"""
+        try:
+            self.signals.analyzer_ready.emit(MarketAnalyzer())
+        except Exception as e:
+            logger.error(f"Erro ao inicializar analisador: {e}")
+            self.signals.error_occurred.emit(str(e))
+
+
 class MarketAnalyzerGUI(QMainWindow):
     """Interface gráfica principal do Market Analyzer"""
     
-    trade_signal_received = pyqtSignal(dict)
+    trade_signal_received = pyqtSignal(object)
+    # Erro ao gravar a configuração na thread de escrita
+    config_save_failed = pyqtSignal(str)
+    
+    # Intervalo máximo de um QTimer (ms, 24 dias)
+    MAX_TIMER_MS = 24 * 24 * 3600 * 1000
+    # Linhas mantidas nos logs da interface (as mais antigas são descartadas)
+    LOG_MAX_LINES = 1000
+    # Atraso para agrupar mensagens de log em um único append (ms)
+    LOG_FLUSH_MS = 200
+    # Atraso para agrupar mudanças de URL do navegador (redirecionamentos, fragmentos) (ms)
+    URL_BAR_UPDATE_MS = 50
+    # Ordens pendentes mantidas na lista do navegador (as mais antigas são descartadas)
+    PENDING_ORDERS_MAX = 500
     
     def __init__(self):
         super().__init__()
         
         self.config_manager = ConfigManager()
         self.data_provider = None
-        self.analyzer = MarketAnalyzer()
+        # Criado em AnalyzerInitTask; None até ficar pronto
+        self.analyzer = None
+        self._analyzer_task = None
         self.trading_bot = None
-        self.analysis_thread = None
-        # Ordens pendentes para execução no navegador (lista de dict)
-        self.pending_browser_orders = []
+        # Pool de uma thread reutilizada entre análises; o semáforo evita análises sobrepostas
+        self.analysis_pool = QThreadPool()
+        self.analysis_pool.setMaxThreadCount(1)
+        self._analysis_busy = QSemaphore(1)
+        self._analysis_task = None
+        # (símbolo, timeframe, timestamp) do último candle analisado
+        self._last_analyzed_candle = None
+        # Entradas da última montagem da lista do autotrade
+        self._autotrade_key = None
+        # Gerador de URL da página de trade por tipo de ativo
+        self._url_builders = {
+            ASSET_TYPE_CRYPTO: self._crypto_trade_url,
+            ASSET_TYPE_STOCK: lambda s: f"https://www.tradingview.com/chart/?symbol={s}",
+            ASSET_TYPE_FOREX: lambda s: f"https://www.tradingview.com/chart/?symbol=FX%3A{s.replace('/', '')}",
+        }
+        # Índices das abas consultadas em eventos (definidos ao criar as abas)
+        self._browser_tab_index = -1
+        self._time_limit_tab_index = -1
+        # Inicialização do provedor em andamento (só o resultado da última é aplicado)
+        self._provider_task = None
         self.last_ai_order = None  # Última ordem recebida da IA (para painel no navegador)
-        
-        # Timer para análise automática
+        # Espelhos em Python das listas de favoritos/ações/forex (mesma ordem dos QListWidget)
+        self._favorite_markets = []
+        self._stock_symbols = []
+        self._forex_pairs = []
+        # Conjuntos paralelos para checagem de duplicados em O(1)
+        self._favorite_set = set()
+        self._stock_set = set()
+        self._forex_set = set()
+        # Últimos valores exibidos no painel de resultado (evita repaints sem mudança)
+        self._last_direction = None
+        self._last_confidence = -1
+        # Configuração em memória (lida do disco uma única vez); gravações em disco são agrupadas
+        self._config = None
+        self._config_dirty = False
+        self._config_save_timer = QTimer(self)
+        self._config_save_timer.setSingleShot(True)
+        self._config_save_timer.setInterval(500)
+        self._config_save_timer.timeout.connect(self._flush_config)
+        
+        # Timer para análise automática (disparo único, reagendado no fechamento de cada candle)
         self.auto_analysis_timer = QTimer()
-        self.auto_analysis_timer.timeout.connect(self.run_analysis)
+        self.auto_analysis_timer.setSingleShot(True)
+        self.auto_analysis_timer.timeout.connect(self._on_auto_analysis_timer)
         
-        # Timer para verificar limite de tempo
+        # Timer de disparo único para o limite de tempo (agendado em apply_time_limit)
         self.time_limit_timer = QTimer()
-        self.time_limit_timer.timeout.connect(self.check_time_limit)
-        self.time_limit_timer.start(1000)  # Verifica a cada segundo
-        
-        self.start_time = datetime.now()
+        self.time_limit_timer.setSingleShot(True)
+        # Grosso (±5%): um disparo adiantado só reagenda, pois _on_time_limit_hit confere o prazo
+        self.time_limit_timer.setTimerType(Qt.CoarseTimer)
+        self.time_limit_timer.timeout.connect(self._on_time_limit_hit)
+        
+        # Mensagens de log aguardando o próximo flush na interface; em rajadas
+        # as mais antigas são descartadas (o documento só mantém LOG_MAX_LINES)
+        self._log_pending = deque(maxlen=self.LOG_MAX_LINES)
+        self._log_flush_timer = QTimer()
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(self.LOG_FLUSH_MS)
+        # Precisão de milissegundos é irrelevante para o flush do log
+        self._log_flush_timer.setTimerType(Qt.CoarseTimer)
+        self._log_flush_timer.timeout.connect(self._flush_log)
+        
+        # Última URL do navegador aguardando exibição na barra
+        self._pending_url = None
+        self._url_bar_timer = QTimer()
+        self._url_bar_timer.setSingleShot(True)
+        self._url_bar_timer.setInterval(self.URL_BAR_UPDATE_MS)
+        self._url_bar_timer.timeout.connect(self._flush_url_bar)
+        
+        # Relógio monotônico desde o início; prazos do limite de tempo em ms nessa escala
+        self._elapsed = QElapsedTimer()
+        self._elapsed.start()
         self.time_limit_enabled = False
-        self.time_limit_end = None
+        self._time_limit_deadline_ms = None
         
         self.init_ui()
         self.trade_signal_received.connect(self.on_trade_signal_from_bot)
+        self.config_save_failed.connect(lambda msg: self.log(f"Erro ao gravar configurações: {msg}"))
+        self.init_analyzer()
         self.load_config()
     
+    def init_analyzer(self):
+        """Cria o analisador no pool global; a janela abre sem esperá-lo"""
+        self._analyzer_task = AnalyzerInitTask()
+        self._analyzer_task.signals.analyzer_ready.connect(self._on_analyzer_ready)
+        self._analyzer_task.signals.error_occurred.connect(
+            lambda msg: self.log(f"ERRO ao carregar o modelo: {msg}")
+        )
+        QThreadPool.globalInstance().start(self._analyzer_task)
+    
+    def _on_analyzer_ready(self, analyzer):
+        """Analisador criado no worker: passa a ser a instância da GUI e do bot"""
+        self._analyzer_task = None
+        self.analyzer = analyzer
+    
     def init_ui(self):
         """Inicializa a interface do usuário"""
         self.setWindowTitle("Market Analyzer - AI Trading Assistant")
@@ -156,12 +535,11 @@ class MarketAnalyzerGUI(QMainWindow):
         # Aba 5: Limite de Tempo
         self.create_time_limit_tab()
         
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+        
         # Barra de status
         self.status_bar = self.statusBar()
         self.status_bar.showMessage("Pronto")
-        
-        # Aplicar estilo
-        self.apply_style()
     
     def create_analysis_tab(self):
         """Cria aba de análise"""
@@ -177,6 +555,17 @@ class MarketAnalyzerGUI(QMainWindow):
         self.symbol_combo = QComboBox()
         self.symbol_combo.setEditable(True)
         self.symbol_combo.setMinimumWidth(150)
+        # Lista completa de mercados num único modelo; o completer filtra em C++ (contém, sem caixa)
+        self._markets_model = QStringListModel(self)
+        self.symbol_combo.setModel(self._markets_model)
+        self.symbol_combo.view().setUniformItemSizes(True)
+        # Largura fixa em caracteres: o combo não mede todos os milhares de itens a cada reset
+        self.symbol_combo.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+        self.symbol_combo.setMinimumContentsLength(14)
+        self._symbol_completer = QCompleter(self._markets_model, self)
+        self._symbol_completer.setFilterMode(Qt.MatchContains)
+        self._symbol_completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.symbol_combo.setCompleter(self._symbol_completer)
         controls_layout.addWidget(self.symbol_combo)
         
         # Botão de busca
@@ -193,8 +582,8 @@ class MarketAnalyzerGUI(QMainWindow):
         
         # Botão de análise
         self.analyze_btn = QPushButton("Analisar")
-        self.analyze_btn.clicked.connect(self.run_analysis)
-        self.analyze_btn.setStyleSheet("background-color: #4CAF50; color: white; font-weight: bold;")
+        self.analyze_btn.clicked.connect(lambda: self.run_analysis())
+        self.analyze_btn.setObjectName("success")
         controls_layout.addWidget(self.analyze_btn)
         
         # Análise automática
@@ -207,6 +596,7 @@ class MarketAnalyzerGUI(QMainWindow):
         self.auto_interval_spin.setMaximum(3600)
         self.auto_interval_spin.setValue(60)
         self.auto_interval_spin.setSuffix(" seg")
+        self.auto_interval_spin.setToolTip("Intervalo mínimo; a análise roda no fechamento do candle seguinte")
         controls_layout.addWidget(self.auto_interval_spin)
         
         controls_layout.addStretch()
@@ -226,6 +616,12 @@ class MarketAnalyzerGUI(QMainWindow):
         self.direction_label.setFont(QFont("Arial", 24, QFont.Bold))
         self.direction_label.setAlignment(Qt.AlignCenter)
         direction_layout.addWidget(self.direction_label)
+        # Paletas prontas por direção: setPalette não passa pelo parser de QSS
+        self._direction_palettes = {}
+        for key, color in _DIRECTION_COLORS.items():
+            palette = QPalette(self.direction_label.palette())
+            palette.setColor(QPalette.WindowText, QColor(color))
+            self._direction_palettes[key] = palette
         result_layout.addLayout(direction_layout)
         
         # Confiança
@@ -253,6 +649,7 @@ class MarketAnalyzerGUI(QMainWindow):
         log_layout = QVBoxLayout()
         self.log_text = QTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.document().setMaximumBlockCount(self.LOG_MAX_LINES)
         log_layout.addWidget(self.log_text)
         log_group.setLayout(log_layout)
         splitter.addWidget(log_group)
@@ -274,7 +671,9 @@ class MarketAnalyzerGUI(QMainWindow):
         ex_layout = QHBoxLayout()
         ex_layout.addWidget(QLabel("Exchange:"))
         self.exchange_combo = QComboBox()
-        self.exchange_combo.addItems(list(DataProvider.get_supported_exchanges().values()))
+        # ID ccxt guardado no próprio item (lido com currentData ao salvar)
+        for name, exchange_id in _exchange_name_to_id().items():
+            self.exchange_combo.addItem(name, exchange_id)
         ex_layout.addWidget(self.exchange_combo)
         exchange_layout.addLayout(ex_layout)
         
@@ -358,7 +757,7 @@ class MarketAnalyzerGUI(QMainWindow):
         
         save_btn = QPushButton("Salvar Configurações")
         save_btn.clicked.connect(self.save_config)
-        save_btn.setStyleSheet("background-color: #2196F3; color: white;")
+        save_btn.setObjectName("primary")
         btn_layout.addWidget(save_btn)
         
         load_btn = QPushButton("Recarregar Configurações")
@@ -385,6 +784,12 @@ class MarketAnalyzerGUI(QMainWindow):
         self.bot_status_label = QLabel("Status: Parado")
         self.bot_status_label.setFont(QFont("Arial", 12, QFont.Bold))
         status_layout.addWidget(self.bot_status_label)
+        # Paletas prontas por status (mesma abordagem do rótulo de direção)
+        self._bot_status_palettes = {}
+        for running, color in _BOT_STATUS_COLORS.items():
+            palette = QPalette(self.bot_status_label.palette())
+            palette.setColor(QPalette.WindowText, QColor(color))
+            self._bot_status_palettes[running] = palette
         
         status_group.setLayout(status_layout)
         layout.addWidget(status_group)
@@ -397,12 +802,12 @@ class MarketAnalyzerGUI(QMainWindow):
         
         self.start_bot_btn = QPushButton("Iniciar Bot")
         self.start_bot_btn.clicked.connect(self.start_trading_bot)
-        self.start_bot_btn.setStyleSheet("background-color: #4CAF50; color: white;")
+        self.start_bot_btn.setObjectName("success")
         btn_layout.addWidget(self.start_bot_btn)
         
         self.stop_bot_btn = QPushButton("Parar Bot")
         self.stop_bot_btn.clicked.connect(self.stop_trading_bot)
-        self.stop_bot_btn.setStyleSheet("background-color: #f44336; color: white;")
+        self.stop_bot_btn.setObjectName("danger")
         self.stop_bot_btn.setEnabled(False)
         btn_layout.addWidget(self.stop_bot_btn)
         
@@ -449,6 +854,7 @@ class MarketAnalyzerGUI(QMainWindow):
         
         self.trades_text = QTextEdit()
         self.trades_text.setReadOnly(True)
+        self.trades_text.document().setMaximumBlockCount(self.LOG_MAX_LINES)
         trades_layout.addWidget(self.trades_text)
         
         trades_group.setLayout(trades_layout)
@@ -488,42 +894,22 @@ class MarketAnalyzerGUI(QMainWindow):
         
         layout.addLayout(nav_layout)
         
-        # Navegador web
-        self.browser = QWebEngineView()
-        self.browser.setUrl(QUrl("https://www.tradingview.com"))
-        self.browser.urlChanged.connect(self.update_url_bar)
-        layout.addWidget(self.browser)
+        # Navegador web: o QWebEngineView (processo Chromium) só é criado
+        # quando a aba é aberta pela primeira vez (ver _ensure_browser)
+        self.browser = None
+        self._browser_layout = layout
+        self._browser_placeholder = QLabel("Carregando…")
+        self._browser_placeholder.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self._browser_placeholder, 1)
         
         # Botões rápidos
         quick_links_layout = QHBoxLayout()
         
-        tv_btn = QPushButton("TradingView")
-        tv_btn.clicked.connect(lambda: self.browser.setUrl(QUrl("https://www.tradingview.com")))
-        quick_links_layout.addWidget(tv_btn)
-        
-        binance_btn = QPushButton("Binance")
-        binance_btn.clicked.connect(lambda: self.browser.setUrl(QUrl("https://www.binance.com")))
-        quick_links_layout.addWidget(binance_btn)
-        
-        coinbase_btn = QPushButton("Coinbase")
-        coinbase_btn.clicked.connect(lambda: self.browser.setUrl(QUrl("https://www.coinbase.com")))
-        quick_links_layout.addWidget(coinbase_btn)
-        
-        kraken_btn = QPushButton("Kraken")
-        kraken_btn.clicked.connect(lambda: self.browser.setUrl(QUrl("https://www.kraken.com")))
-        quick_links_layout.addWidget(kraken_btn)
-        
-        bybit_btn = QPushButton("Bybit")
-        bybit_btn.clicked.connect(lambda: self.browser.setUrl(QUrl("https://www.bybit.com")))
-        quick_links_layout.addWidget(bybit_btn)
-        
-        okx_btn = QPushButton("OKX")
-        okx_btn.clicked.connect(lambda: self.browser.setUrl(QUrl("https://www.okx.com")))
-        quick_links_layout.addWidget(okx_btn)
-        
-        bitget_btn = QPushButton("Bitget")
-        bitget_btn.clicked.connect(lambda: self.browser.setUrl(QUrl("https://www.bitget.com")))
-        quick_links_layout.addWidget(bitget_btn)
+        # QUrl montado uma vez por link (não a cada clique)
+        for label, address in QUICK_LINKS:
+            btn = QPushButton(label)
+            btn.clicked.connect(functools.partial(self._open_browser_url, QUrl(address)))
+            quick_links_layout.addWidget(btn)
         
         quick_links_layout.addStretch()
         layout.addLayout(quick_links_layout)
@@ -547,7 +933,7 @@ class MarketAnalyzerGUI(QMainWindow):
         ai_order_group.setLayout(ai_order_layout)
         layout.addWidget(ai_order_group)
         
-        self.tabs.addTab(tab, "Navegador")
+        self._browser_tab_index = self.tabs.addTab(tab, "Navegador")
     
     def create_time_limit_tab(self):
         """Cria aba de limite de tempo"""
@@ -647,7 +1033,7 @@ class MarketAnalyzerGUI(QMainWindow):
         # Botão aplicar
         apply_btn = QPushButton("Aplicar Limite")
         apply_btn.clicked.connect(self.apply_time_limit)
-        apply_btn.setStyleSheet("background-color: #2196F3; color: white;")
+        apply_btn.setObjectName("primary")
         limit_layout.addWidget(apply_btn)
         
         limit_group.setLayout(limit_layout)
@@ -655,47 +1041,44 @@ class MarketAnalyzerGUI(QMainWindow):
         
         layout.addStretch()
         
-        self.tabs.addTab(tab, "Limite de Tempo")
+        self._time_limit_tab_index = self.tabs.addTab(tab, "Limite de Tempo")
         
-        # Timer para atualizar display de tempo
+        # Timer para atualizar display de tempo (só roda com a aba visível)
         self.time_display_timer = QTimer()
+        self.time_display_timer.setInterval(1000)
+        # Display em segundos: timer grosso deixa o SO agrupar os despertares
+        self.time_display_timer.setTimerType(Qt.CoarseTimer)
         self.time_display_timer.timeout.connect(self.update_time_display)
-        self.time_display_timer.start(1000)
-    
-    def apply_style(self):
-        """Aplica estilo à interface"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #f5f5f5;
-            }
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #cccccc;
-                border-radius: 5px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-            QPushButton {
-                padding: 8px 15px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                opacity: 0.8;
-            }
-        """)
+    
+    def _on_tab_changed(self, index):
+        """Liga/desliga trabalho que só interessa à aba visível"""
+        if index == self._browser_tab_index:
+            self._ensure_browser()
+        
+        self._update_time_display_timer()
+    
+    def _update_time_display_timer(self):
+        """Relógio de 1 Hz só roda com a aba de limite visível e a janela não minimizada"""
+        if self.tabs.currentIndex() == self._time_limit_tab_index and not self.isMinimized():
+            self.update_time_display()
+            self.time_display_timer.start()
+        else:
+            self.time_display_timer.stop()
+    
+    def changeEvent(self, event):
+        """Pausa/retoma o relógio da interface ao minimizar/restaurar"""
+        # (a janela pode mudar de estado antes de init_ui criar o timer)
+        if event.type() == QEvent.WindowStateChange and hasattr(self, 'time_display_timer'):
+            self._update_time_display_timer()
+        super().changeEvent(event)
     
     # Métodos de funcionalidade
     
     def load_config(self):
         """Carrega configurações"""
         try:
-            config = self.config_manager.load_config()
+            self._config = self.config_manager.load_config()
+            config = self._config
             
             # Exchange
             exchange_name = config.get('exchange', 'Binance')
@@ -707,16 +1090,24 @@ class MarketAnalyzerGUI(QMainWindow):
             self.api_key_input.setText(config.get('api_key', ''))
             self.api_secret_input.setText(config.get('api_secret', ''))
             
-            # Mercados favoritos
-            favorites = config.get('favorite_markets', [])
-            self.markets_list.clear()
-            self.markets_list.addItems(favorites)
+            # Mercados favoritos (sem duplicados, mantendo a ordem: listas e conjuntos ficam em sincronia)
+            self._favorite_markets = list(dict.fromkeys(config.get('favorite_markets', [])))
+            self._favorite_set = set(self._favorite_markets)
+            with _bulk_update(self.markets_list):
+                self.markets_list.clear()
+                self.markets_list.addItems(self._favorite_markets)
             
             # Ações e Forex
-            self.stocks_list.clear()
-            self.stocks_list.addItems(config.get('stock_symbols', []))
-            self.forex_list.clear()
-            self.forex_list.addItems(config.get('forex_pairs', []))
+            self._stock_symbols = list(dict.fromkeys(config.get('stock_symbols', [])))
+            self._stock_set = set(self._stock_symbols)
+            with _bulk_update(self.stocks_list):
+                self.stocks_list.clear()
+                self.stocks_list.addItems(self._stock_symbols)
+            self._forex_pairs = list(dict.fromkeys(config.get('forex_pairs', [])))
+            self._forex_set = set(self._forex_pairs)
+            with _bulk_update(self.forex_list):
+                self.forex_list.clear()
+                self.forex_list.addItems(self._forex_pairs)
             
             self.execute_via_browser_check.setChecked(config.get('execute_via_browser', False))
             
@@ -735,28 +1126,20 @@ class MarketAnalyzerGUI(QMainWindow):
         """Salva configurações"""
         try:
             exchange_name = self.exchange_combo.currentText()
-            exchange_id = None
-            for eid, ename in DataProvider.get_supported_exchanges().items():
-                if ename == exchange_name:
-                    exchange_id = eid
-                    break
-            
-            config = self.config_manager.load_config()
-            config.update({
+            exchange_id = self.exchange_combo.currentData()
+            
+            self._get_config().update({
                 'exchange': exchange_name,
                 'exchange_id': exchange_id or 'binance',
                 'api_key': self.api_key_input.text(),
                 'api_secret': self.api_secret_input.text(),
-                'favorite_markets': [
-                    self.markets_list.item(i).text() 
-                    for i in range(self.markets_list.count())
-                ],
-                'stock_symbols': [self.stocks_list.item(i).text() for i in range(self.stocks_list.count())],
-                'forex_pairs': [self.forex_list.item(i).text() for i in range(self.forex_list.count())],
+                'favorite_markets': list(self._favorite_markets),
+                'stock_symbols': list(self._stock_symbols),
+                'forex_pairs': list(self._forex_pairs),
                 'execute_via_browser': self.execute_via_browser_check.isChecked(),
             })
             
-            self.config_manager.save_config(config)
+            self._schedule_config_save()
             
             # Reinicializa data provider
             self.init_data_provider()
@@ -768,52 +1151,128 @@ class MarketAnalyzerGUI(QMainWindow):
             logger.error(f"Erro ao salvar configurações: {e}")
             QMessageBox.critical(self, "Erro", f"Erro ao salvar configurações: {e}")
     
+    def _get_config(self) -> Dict:
+        """Configuração em memória, carregada do disco no primeiro acesso"""
+        if self._config is None:
+            self._config = self.config_manager.load_config()
+        return self._config
+    
+    def _schedule_config_save(self):
+        """Marca a configuração como alterada e agenda a gravação (debounce de 500 ms)"""
+        self._config_dirty = True
+        self._config_save_timer.start()
+    
+    def _flush_config(self, wait=False):
+        """
+        Grava a configuração em memória no disco, se houver alterações pendentes.
+        A escrita (criptografia, JSON, fsync) roda fora da thread da GUI sobre
+        uma cópia; com wait=True espera terminar (fechamento da janela).
+        """
+        self._config_save_timer.stop()
+        if not self._config_dirty or self._config is None:
+            return
+        self._config_dirty = False
+        future = _CONFIG_WRITER.submit(self.config_manager.save_config, copy.deepcopy(self._config))
+        if wait:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Erro ao gravar configurações: {e}")
+        else:
+            future.add_done_callback(self._on_config_saved)
+    
+    def _on_config_saved(self, future):
+        """Conclusão da gravação (thread de escrita): erros vão para o log via sinal"""
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Erro ao gravar configurações: {error}")
+            self.config_save_failed.emit(str(error))
+    
     def init_data_provider(self):
         """Inicializa o provedor de dados"""
         try:
-            config = self.config_manager.load_config()
+            config = self._get_config()
             exchange_id = config.get('exchange_id', 'binance')
             api_key = config.get('api_key', '')
             api_secret = config.get('api_secret', '')
             
-            self.data_provider = DataProvider(
-                exchange_name=exchange_id,
+            # Conexão e lista de mercados (rede) rodam no pool global; a GUI segue responsiva
+            task = ProviderInitTask(
+                exchange_id,
                 api_key=api_key if api_key else None,
                 api_secret=api_secret if api_secret else None
             )
+            task.signals.provider_ready.connect(
+                lambda provider, markets, t=task: self._on_provider_ready(t, provider, markets)
+            )
+            task.signals.error_occurred.connect(
+                lambda msg, t=task: self._on_provider_error(t, msg)
+            )
+            self._provider_task = task
+            QThreadPool.globalInstance().start(task)
             
-            # Carrega símbolos
-            self.load_symbols()
-            
-            self.log(f"Conectado à exchange: {exchange_id}")
+            self.log(f"Conectando à exchange: {exchange_id}...")
             
         except Exception as e:
             logger.error(f"Erro ao inicializar data provider: {e}")
             self.log(f"ERRO: {e}")
     
-    def load_symbols(self):
-        """Carrega símbolos disponíveis"""
+    def _on_provider_ready(self, task, provider, markets):
+        """Provedor criado no worker: assume-o e preenche os símbolos"""
+        if task is not self._provider_task:
+            # Resultado de uma inicialização já substituída (ex.: salvou de novo)
+            self._release_provider(provider)
+            return
+        self._provider_task = None
+        
+        previous = self.data_provider
+        self.data_provider = provider
+        self._release_provider(previous)
+        self.load_symbols(markets)
+        self.log(f"Conectado à exchange: {task.exchange_id}")
+    
+    def _release_provider(self, provider):
+        """Fecha fora da thread da GUI um provedor que a janela e o bot não usam mais"""
+        if provider is None or provider is self.data_provider:
+            return
+        if self.trading_bot is not None and self.trading_bot.data_provider is provider:
+            # Ainda em uso pelo bot: liberado em stop_trading_bot
+            return
+        pool = self.analysis_pool
+        
+        def close():
+            # Uma análise em andamento pode estar usando o provedor antigo
+            pool.waitForDone()
+            provider.close()
+        
+        _PROVIDER_CLOSER.submit(close)
+    
+    def _on_provider_error(self, task, message):
+        """Falha ao inicializar o provedor no worker"""
+        if task is not self._provider_task:
+            return
+        self._provider_task = None
+        self.log(f"ERRO: {message}")
+    
+    def load_symbols(self, markets=None):
+        """Carrega símbolos disponíveis (usa a lista já obtida, se fornecida)"""
         try:
             if not self.data_provider:
                 return
             
-            markets = self.data_provider.get_available_markets()
-            
-            # Adiciona ao combo
-            self.symbol_combo.clear()
-            
-            # Adiciona favoritos primeiro
-            favorites = [
-                self.markets_list.item(i).text() 
-                for i in range(self.markets_list.count())
-            ]
+            if markets is None:
+                markets = self.data_provider.get_available_markets()
             
-            if favorites:
-                self.symbol_combo.addItems(favorites)
-                self.symbol_combo.insertSeparator(len(favorites))
-            
-            # Adiciona todos os mercados
-            self.symbol_combo.addItems(markets[:500])  # Limita a 500 para performance
+            # Favoritos primeiro, depois todos os mercados (um único reset do modelo,
+            # sem sinais/repaint do combo; o símbolo digitado é preservado)
+            favorite_set = self._favorite_set
+            with _bulk_update(self.symbol_combo):
+                current = self.symbol_combo.currentText()
+                self._markets_model.setStringList(
+                    self._favorite_markets + [m for m in markets if m not in favorite_set]
+                )
+                if current:
+                    self.symbol_combo.setCurrentText(current)
             
             self.log(f"Carregados {len(markets)} mercados")
             
@@ -831,12 +1290,13 @@ class MarketAnalyzerGUI(QMainWindow):
             if not query:
                 return
             
-            results = self.data_provider.search_symbols(query)
+            # Filtra localmente sobre a lista de mercados já carregada
+            self._symbol_completer.setCompletionPrefix(query)
+            count = self._symbol_completer.completionCount()
             
-            if results:
-                self.symbol_combo.clear()
-                self.symbol_combo.addItems(results)
-                self.log(f"Encontrados {len(results)} símbolos para '{query}'")
+            if count:
+                self._symbol_completer.complete()
+                self.log(f"Encontrados {count} símbolos para '{query}'")
             else:
                 QMessageBox.information(self, "Busca", f"Nenhum símbolo encontrado para '{query}'")
                 
@@ -847,7 +1307,9 @@ class MarketAnalyzerGUI(QMainWindow):
     def add_favorite_market(self):
         """Adiciona mercado aos favoritos"""
         symbol = self.symbol_combo.currentText()
-        if symbol and not self.markets_list.findItems(symbol, Qt.MatchExactly):
+        if symbol and symbol not in self._favorite_set:
+            self._favorite_markets.append(symbol)
+            self._favorite_set.add(symbol)
             self.markets_list.addItem(symbol)
             self.log(f"Adicionado aos favoritos: {symbol}")
     
@@ -856,13 +1318,18 @@ class MarketAnalyzerGUI(QMainWindow):
         current_item = self.markets_list.currentItem()
         if current_item:
             symbol = current_item.text()
-            self.markets_list.takeItem(self.markets_list.row(current_item))
+            row = self.markets_list.row(current_item)
+            self.markets_list.takeItem(row)
+            del self._favorite_markets[row]
+            self._favorite_set.discard(symbol)
             self.log(f"Removido dos favoritos: {symbol}")
     
     def add_stock_symbol(self):
         """Adiciona ação à lista"""
         text = self.stock_input.text().strip().upper()
-        if text and not self.stocks_list.findItems(text, Qt.MatchExactly):
+        if text and text not in self._stock_set:
+            self._stock_symbols.append(text)
+            self._stock_set.add(text)
             self.stocks_list.addItem(text)
             self.stock_input.clear()
             self.log(f"Ação adicionada: {text}")
@@ -871,13 +1338,18 @@ class MarketAnalyzerGUI(QMainWindow):
         """Remove ação da lista"""
         current = self.stocks_list.currentItem()
         if current:
-            self.stocks_list.takeItem(self.stocks_list.row(current))
+            row = self.stocks_list.row(current)
+            self.stocks_list.takeItem(row)
+            del self._stock_symbols[row]
+            self._stock_set.discard(current.text())
             self.log(f"Ação removida: {current.text()}")
     
     def add_forex_pair(self):
         """Adiciona par forex à lista"""
         text = self.forex_input.text().strip().upper().replace(' ', '')
-        if text and '/' in text and not self.forex_list.findItems(text, Qt.MatchExactly):
+        if text and '/' in text and text not in self._forex_set:
+            self._forex_pairs.append(text)
+            self._forex_set.add(text)
             self.forex_list.addItem(text)
             self.forex_input.clear()
             self.log(f"Forex adicionado: {text}")
@@ -886,48 +1358,62 @@ class MarketAnalyzerGUI(QMainWindow):
         """Remove par forex da lista"""
         current = self.forex_list.currentItem()
         if current:
-            self.forex_list.takeItem(self.forex_list.row(current))
+            row = self.forex_list.row(current)
+            self.forex_list.takeItem(row)
+            del self._forex_pairs[row]
+            self._forex_set.discard(current.text())
             self.log(f"Forex removido: {current.text()}")
     
     def refresh_autotrade_list(self):
         """Atualiza a lista de ativos do autotrade a partir das configurações (crypto, ações, forex)."""
         try:
-            config = self.config_manager.load_config()
-            crypto_list = config.get('favorite_markets', [])
-            stocks_list = config.get('stock_symbols', [])
-            forex_list = config.get('forex_pairs', [])
-            autotrade_crypto = set(config.get('autotrade_crypto', []))
-            autotrade_stocks = set(config.get('autotrade_stocks', []))
-            autotrade_forex = set(config.get('autotrade_forex', []))
-            self.autotrade_assets_list.clear()
-            for symbol in crypto_list:
-                item = QListWidgetItem(symbol)
-                item.setData(Qt.UserRole, ASSET_TYPE_CRYPTO)
-                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
-                item.setCheckState(Qt.Checked if (not autotrade_crypto or symbol in autotrade_crypto) else Qt.Unchecked)
-                self.autotrade_assets_list.addItem(item)
-            for symbol in stocks_list:
-                item = QListWidgetItem(symbol)
-                item.setData(Qt.UserRole, ASSET_TYPE_STOCK)
-                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
-                item.setCheckState(Qt.Checked if (not autotrade_stocks or symbol in autotrade_stocks) else Qt.Unchecked)
-                self.autotrade_assets_list.addItem(item)
-            for symbol in forex_list:
-                item = QListWidgetItem(symbol)
-                item.setData(Qt.UserRole, ASSET_TYPE_FOREX)
-                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
-                item.setCheckState(Qt.Checked if (not autotrade_forex or symbol in autotrade_forex) else Qt.Unchecked)
-                self.autotrade_assets_list.addItem(item)
+            config = self._get_config()
+            groups = (
+                (ASSET_TYPE_CRYPTO, config.get('favorite_markets', []), config.get('autotrade_crypto', [])),
+                (ASSET_TYPE_STOCK, config.get('stock_symbols', []), config.get('autotrade_stocks', [])),
+                (ASSET_TYPE_FOREX, config.get('forex_pairs', []), config.get('autotrade_forex', [])),
+            )
+            
+            # Mesmas listas e seleções da última montagem: nada a refazer
+            key = tuple((atype, tuple(symbols), frozenset(selected)) for atype, symbols, selected in groups)
+            if key == self._autotrade_key:
+                return
+            
+            # Monta todos os itens antes e insere com a lista já sem sinais/repaint
+            items = []
+            for atype, symbols, selected in groups:
+                selected = set(selected)
+                # Sem seleção salva para o grupo: todos marcados
+                default_checked = not selected
+                for symbol in symbols:
+                    item = QListWidgetItem(symbol)
+                    item.setData(Qt.UserRole, atype)
+                    item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+                    item.setCheckState(Qt.Checked if (default_checked or symbol in selected) else Qt.Unchecked)
+                    items.append(item)
+            
+            with _bulk_update(self.autotrade_assets_list):
+                self.autotrade_assets_list.clear()
+                for item in items:
+                    self.autotrade_assets_list.addItem(item)
+            self._autotrade_key = key
         except Exception as e:
             logger.error(f"Erro ao atualizar lista do autotrade: {e}")
     
-    def run_analysis(self):
-        """Executa análise de mercado"""
+    def run_analysis(self, only_new_candle=False):
+        """
+        Executa análise de mercado. Com only_new_candle (análise automática),
+        a análise é pulada se a exchange ainda não fechou um candle novo.
+        """
         try:
             if not self.data_provider:
                 QMessageBox.warning(self, "Aviso", "Configure a exchange primeiro!")
                 return
             
+            if self.analyzer is None:
+                self.status_bar.showMessage("Modelo carregando...")
+                return
+            
             symbol = self.symbol_combo.currentText()
             timeframe = self.timeframe_combo.currentText()
             
@@ -935,71 +1421,66 @@ class MarketAnalyzerGUI(QMainWindow):
                 QMessageBox.warning(self, "Aviso", "Selecione um símbolo!")
                 return
             
+            # Análise anterior ainda em andamento (ex: disparo do timer automático)
+            if not self._analysis_busy.tryAcquire():
+                return
+            
             self.log(f"Iniciando análise: {symbol} ({timeframe})")
             self.analyze_btn.setEnabled(False)
             self.status_bar.showMessage(f"Analisando {symbol}...")
             
-            # Inicia thread de análise
-            self.analysis_thread = AnalysisThread(
+            skip_candle_ts = None
+            last = self._last_analyzed_candle
+            if only_new_candle and last and last[:2] == (symbol, timeframe):
+                skip_candle_ts = last[2]
+            
+            # Enfileira a análise no pool (referência mantida até o sinal ser entregue)
+            self._analysis_task = AnalysisTask(
                 self.data_provider,
                 self.analyzer,
                 symbol,
-                timeframe
+                timeframe,
+                DataProvider.detect_asset_type(symbol),
+                skip_candle_ts=skip_candle_ts,
             )
-            self.analysis_thread.analysis_complete.connect(self.on_analysis_complete)
-            self.analysis_thread.error_occurred.connect(self.on_analysis_error)
-            self.analysis_thread.start()
+            self._analysis_task.signals.analysis_complete.connect(self.on_analysis_complete)
+            self._analysis_task.signals.analysis_skipped.connect(self.on_analysis_skipped)
+            self._analysis_task.signals.error_occurred.connect(self.on_analysis_error)
+            self.analysis_pool.start(self._analysis_task)
             
         except Exception as e:
             logger.error(f"Erro ao iniciar análise: {e}")
             self.log(f"ERRO: {e}")
-            self.analyze_btn.setEnabled(True)
+            self._finish_analysis()
     
     def on_analysis_complete(self, prediction):
         """Callback quando análise é completada"""
         try:
+            task = self._analysis_task
+            if task is not None:
+                self._last_analyzed_candle = (task.symbol, task.timeframe, task.candle_ts)
+            
             direction = prediction['direction']
             confidence = prediction['confidence']
-            details = prediction['details']
             
-            # Atualiza UI
-            self.direction_label.setText(direction)
+            # Atualiza UI (só quando o valor exibido muda)
+            if direction != self._last_direction:
+                self.direction_label.setText(direction)
+                # Cor pela direção (demais valores usam a cor neutra)
+                self.direction_label.setPalette(
+                    self._direction_palettes.get(direction, self._direction_palettes['NEUTRAL'])
+                )
+                self._last_direction = direction
             
-            # Define cor baseado na direção
-            if direction == 'UP':
-                self.direction_label.setStyleSheet("color: #4CAF50;")  # Verde
-            elif direction == 'DOWN':
-                self.direction_label.setStyleSheet("color: #f44336;")  # Vermelho
-            else:
-                self.direction_label.setStyleSheet("color: #FF9800;")  # Laranja
+            confidence_shown = round(float(confidence), 1)
+            if confidence_shown != self._last_confidence:
+                # A barra é inteira: só muda quando a parte inteira muda
+                if int(confidence_shown) != int(self._last_confidence):
+                    self.confidence_bar.setValue(int(confidence_shown))
+                self.confidence_label.setText(_format_confidence(confidence_shown))
+                self._last_confidence = confidence_shown
             
-            self.confidence_bar.setValue(int(confidence))
-            self.confidence_label.setText(f"{confidence:.1f}%")
-            
-            # Formata detalhes
-            details_text = f"""
-=== ANÁLISE COMPLETA ===
-Decisão: {details.get('decision', 'N/A')}
-Força do Sinal: {details.get('signal_strength', 'N/A')}
-
-Preço Atual: ${details.get('current_price', 0):.2f}
-
---- INDICADORES ---
-RSI: {details.get('rsi_value', 0):.2f} - {details.get('rsi_signal', 'N/A')}
-MACD: {details.get('macd_value', 0):.4f} - {details.get('macd_signal', 'N/A')}
-ADX: {details.get('adx_value', 0):.2f} - Tendência {details.get('trend_strength', 'N/A')}
-Bollinger Bands: {details.get('bb_signal', 'N/A')}
-EMA: {details.get('ema_signal', 'N/A')}
-MFI: {details.get('mfi_signal', 'N/A')}
-
---- SINAIS ---
-Sinais de Compra: {details.get('buy_signals', 0)}
-Sinais de Venda: {details.get('sell_signals', 0)}
-
-Timestamp: {prediction.get('timestamp', '')}
-            """
-            
-            self.details_text.setText(details_text)
+            self.details_text.setText(prediction['details_text'])
             
             self.log(f"Análise concluída: {direction} (confiança: {confidence:.1f}%)")
             self.status_bar.showMessage(f"Análise concluída: {direction}")
@@ -1009,34 +1490,72 @@ Timestamp: {prediction.get('timestamp', '')}
             self.log(f"ERRO ao processar resultado: {e}")
         
         finally:
-            self.analyze_btn.setEnabled(True)
+            self._finish_analysis()
+    
+    def on_analysis_skipped(self):
+        """Callback quando não há candle novo desde a última análise"""
+        self.log("Análise automática: sem candle novo, resultado anterior mantido")
+        self.status_bar.showMessage("Sem candle novo desde a última análise")
+        self._finish_analysis()
     
     def on_analysis_error(self, error_msg):
         """Callback quando ocorre erro na análise"""
         self.log(f"ERRO na análise: {error_msg}")
         self.status_bar.showMessage("Erro na análise")
-        self.analyze_btn.setEnabled(True)
+        self._finish_analysis()
         QMessageBox.critical(self, "Erro", f"Erro na análise: {error_msg}")
     
+    def _finish_analysis(self):
+        """Libera a próxima análise"""
+        self._analysis_task = None
+        self.analyze_btn.setEnabled(True)
+        if self._analysis_busy.available() == 0:
+            self._analysis_busy.release()
+    
     def toggle_auto_analysis(self, state):
         """Ativa/desativa análise automática"""
         if state == Qt.Checked:
-            interval = self.auto_interval_spin.value() * 1000  # Converte para ms
-            self.auto_analysis_timer.start(interval)
-            self.log(f"Análise automática ativada (intervalo: {self.auto_interval_spin.value()}s)")
+            self._schedule_auto_analysis()
+            self.log(
+                f"Análise automática ativada (intervalo mínimo: {self.auto_interval_spin.value()}s, "
+                f"alinhada ao fechamento dos candles)"
+            )
         else:
             self.auto_analysis_timer.stop()
             self.log("Análise automática desativada")
     
+    def _schedule_auto_analysis(self):
+        """
+        Agenda a próxima análise automática para logo após o fechamento do
+        primeiro candle que ocorrer depois do intervalo mínimo configurado
+        (evita rebaixar o mesmo candle várias vezes).
+        """
+        interval = self.auto_interval_spin.value()
+        now = time.time()
+        secs = interval + _secs_to_next_close(self.timeframe_combo.currentText(), now + interval)
+        # Folga de 2s para a exchange fechar o candle
+        self.auto_analysis_timer.start(int((secs + 2) * 1000))
+    
+    def _on_auto_analysis_timer(self):
+        """Disparo da análise automática"""
+        if not self.auto_analysis_check.isChecked():
+            return
+        self._schedule_auto_analysis()
+        self.run_analysis(only_new_candle=True)
+    
     def on_trade_signal_from_bot(self, order_dict: dict):
         """Chamado quando o bot emite sinal de trade para execução no navegador."""
-        self.pending_browser_orders.append(order_dict)
         side = order_dict.get('side', '').upper()
         symbol = order_dict.get('symbol', '')
         amount = order_dict.get('amount', 0)
         price = order_dict.get('price', 0)
         text = f"{side} {symbol} | Qtd: {amount:.6f} @ {price:.2f}"
-        self.pending_orders_list.addItem(text)
+        # A ordem viaja no próprio item (sem lista paralela indexada pela linha)
+        item = QListWidgetItem(text)
+        item.setData(Qt.UserRole, order_dict)
+        self.pending_orders_list.addItem(item)
+        if self.pending_orders_list.count() > self.PENDING_ORDERS_MAX:
+            self.pending_orders_list.takeItem(0)
         self.last_ai_order = order_dict
         self.ai_order_label.setText(
             f"{side} {symbol} | Quantidade: {amount:.6f} | Preço: {price:.2f} | "
@@ -1044,57 +1563,32 @@ Timestamp: {prediction.get('timestamp', '')}
         )
         self.ai_open_page_btn.setEnabled(True)
         self.ai_inject_btn.setEnabled(True)
-        for i in range(self.tabs.count()):
-            if self.tabs.tabText(i) == "Navegador":
-                self.tabs.setCurrentIndex(i)
-                break
+        self.tabs.setCurrentIndex(self._browser_tab_index)
         url = self.get_trade_url(order_dict)
         if url:
-            self.browser.setUrl(QUrl(url))
+            self._ensure_browser().setUrl(QUrl(url))
         self.log(f"Ordem da IA para navegador: {text}")
     
     def get_trade_url(self, order_dict: dict) -> str:
         """Gera URL da página de trade conforme exchange e tipo de ativo."""
-        symbol = order_dict.get('symbol', '')
-        asset_type = order_dict.get('asset_type', ASSET_TYPE_CRYPTO)
-        config = self.config_manager.load_config()
-        exchange_id = (config.get('exchange_id') or 'binance').lower()
-        
-        if asset_type == ASSET_TYPE_CRYPTO:
-            # Binance: https://www.binance.com/en/trade/BTC_USDT
-            pair = symbol.replace('/', '_')
-            if 'binance' in exchange_id:
-                return f"https://www.binance.com/en/trade/{pair}"
-            if exchange_id == 'binanceusdm':
-                return f"https://www.binance.com/en/futures/{pair}"
-            if 'bybit' in exchange_id:
-                return f"https://www.bybit.com/trade/usdt/{pair}"
-            if 'okx' in exchange_id:
-                return f"https://www.okx.com/trade-spot/{symbol.lower()}"
-            if 'kraken' in exchange_id:
-                return f"https://www.kraken.com/charts"
-            return f"https://www.binance.com/en/trade/{pair}"
-        
-        if asset_type == ASSET_TYPE_STOCK:
-            return f"https://www.tradingview.com/chart/?symbol={symbol}"
-        if asset_type == ASSET_TYPE_FOREX:
-            pair = symbol.replace('/', '')
-            return f"https://www.tradingview.com/chart/?symbol=FX%3A{pair}"
-        return ""
+        builder = self._url_builders.get(order_dict.get('asset_type', ASSET_TYPE_CRYPTO))
+        return builder(order_dict.get('symbol', '')) if builder else ""
+    
+    def _crypto_trade_url(self, symbol: str) -> str:
+        """Página de trade de cripto da exchange configurada"""
+        template = _crypto_url_template(self._get_config().get('exchange_id') or 'binance')
+        return template.format(pair=symbol.replace('/', '_'), pair_lower=symbol.lower())
     
     def open_pending_order_in_browser(self):
         """Abre a ordem selecionada na lista no navegador."""
-        row = self.pending_orders_list.currentRow()
-        if row < 0 or row >= len(self.pending_browser_orders):
+        item = self.pending_orders_list.currentItem()
+        if item is None:
             return
-        order = self.pending_browser_orders[row]
+        order = item.data(Qt.UserRole)
         url = self.get_trade_url(order)
         if url:
-            for i in range(self.tabs.count()):
-                if self.tabs.tabText(i) == "Navegador":
-                    self.tabs.setCurrentIndex(i)
-                    break
-            self.browser.setUrl(QUrl(url))
+            self.tabs.setCurrentIndex(self._browser_tab_index)
+            self._ensure_browser().setUrl(QUrl(url))
     
     def open_ai_order_in_browser(self):
         """Abre a última ordem da IA no navegador."""
@@ -1102,11 +1596,8 @@ Timestamp: {prediction.get('timestamp', '')}
             return
         url = self.get_trade_url(self.last_ai_order)
         if url:
-            for i in range(self.tabs.count()):
-                if self.tabs.tabText(i) == "Navegador":
-                    self.tabs.setCurrentIndex(i)
-                    break
-            self.browser.setUrl(QUrl(url))
+            self.tabs.setCurrentIndex(self._browser_tab_index)
+            self._ensure_browser().setUrl(QUrl(url))
     
     def inject_order_into_browser(self):
         """Tenta preencher formulário de ordem na página (Binance – experimental)."""
@@ -1115,22 +1606,9 @@ Timestamp: {prediction.get('timestamp', '')}
             return
         symbol = order.get('symbol', '').replace('/', '')
         amount = order.get('amount', 0)
-        # JavaScript para tentar definir símbolo e quantidade na Binance (estrutura pode mudar)
-        js = f"""
-        (function() {{
-            var sym = '{symbol}';
-            var amt = {amount};
-            var inputs = document.querySelectorAll('input[type="text"], input[placeholder*="Amount"], input[placeholder*="Quantidade"]');
-            for (var i = 0; i < inputs.length; i++) {{
-                if (inputs[i].placeholder && (inputs[i].placeholder.toLowerCase().indexOf('amount') >= 0 || inputs[i].placeholder.toLowerCase().indexOf('quantidade') >= 0)) {{
-                    inputs[i].value = amt;
-                    inputs[i].dispatchEvent(new Event('input', {{ bubbles: true }}));
-                }}
-            }}
-            return 'Tentativa de preenchimento: ' + sym + ' qtd ' + amt;
-        }})();
-        """
-        self.browser.page().runJavaScript(js, lambda result: self.log(f"Inject: {result}" if result else "JS executado"))
+        # Argumentos serializados em JSON (strings escapadas corretamente)
+        js = _INJECT_ORDER_JS % (json.dumps(symbol), json.dumps(amount))
+        self._ensure_browser().page().runJavaScript(js, lambda result: self.log(f"Inject: {result}" if result else "JS executado"))
     
     def start_trading_bot(self):
         """Inicia o bot de trading"""
@@ -1143,6 +1621,10 @@ Timestamp: {prediction.get('timestamp', '')}
                 )
                 return
             
+            if self.analyzer is None:
+                self.status_bar.showMessage("Modelo carregando...")
+                return
+            
             reply = QMessageBox.question(
                 self,
                 "Confirmação",
@@ -1154,43 +1636,39 @@ Timestamp: {prediction.get('timestamp', '')}
                 return
             
             # Coleta ativos marcados para o autotrade e persiste na config
-            autotrade_crypto = []
-            autotrade_stocks = []
-            autotrade_forex = []
+            buckets = {ASSET_TYPE_CRYPTO: [], ASSET_TYPE_STOCK: [], ASSET_TYPE_FOREX: []}
+            item_at = self.autotrade_assets_list.item
             for i in range(self.autotrade_assets_list.count()):
-                item = self.autotrade_assets_list.item(i)
-                if item.checkState() != Qt.Checked:
-                    continue
-                atype = item.data(Qt.UserRole)
-                symbol = item.text()
-                if atype == ASSET_TYPE_CRYPTO:
-                    autotrade_crypto.append(symbol)
-                elif atype == ASSET_TYPE_STOCK:
-                    autotrade_stocks.append(symbol)
-                elif atype == ASSET_TYPE_FOREX:
-                    autotrade_forex.append(symbol)
-            
-            config = self.config_manager.load_config()
+                item = item_at(i)
+                if item.checkState() == Qt.Checked:
+                    bucket = buckets.get(item.data(Qt.UserRole))
+                    if bucket is not None:
+                        bucket.append(item.text())
+            
+            config = self._get_config()
             config['execute_via_browser'] = self.execute_via_browser_check.isChecked()
-            config['autotrade_crypto'] = autotrade_crypto
-            config['autotrade_stocks'] = autotrade_stocks
-            config['autotrade_forex'] = autotrade_forex
+            config['autotrade_crypto'] = buckets[ASSET_TYPE_CRYPTO]
+            config['autotrade_stocks'] = buckets[ASSET_TYPE_STOCK]
+            config['autotrade_forex'] = buckets[ASSET_TYPE_FOREX]
             config['stock_symbols'] = config.get('stock_symbols', [])
             config['forex_pairs'] = config.get('forex_pairs', [])
             config['check_interval'] = config.get('check_interval', 60)
-            self.config_manager.save_config(config)
+            self._schedule_config_save()
             
             self.trading_bot = TradingBot(
                 data_provider=self.data_provider,
                 analyzer=self.analyzer,
-                config=config,
+                config=dict(config),
                 on_trade_signal=lambda d: self.trade_signal_received.emit(d),
             )
             
             self.trading_bot.start()
             
+            if config['execute_via_browser']:
+                self._prewarm_browser(buckets[ASSET_TYPE_CRYPTO])
+            
             self.bot_status_label.setText("Status: ATIVO")
-            self.bot_status_label.setStyleSheet("color: #4CAF50;")
+            self.bot_status_label.setPalette(self._bot_status_palettes[True])
             self.start_bot_btn.setEnabled(False)
             self.stop_bot_btn.setEnabled(True)
             
@@ -1205,11 +1683,14 @@ Timestamp: {prediction.get('timestamp', '')}
         """Para o bot de trading"""
         try:
             if self.trading_bot:
-                self.trading_bot.stop()
+                bot = self.trading_bot
+                bot.stop()
                 self.trading_bot = None
+                # Provedor de uma exchange já trocada, mantido só para o bot
+                self._release_provider(bot.data_provider)
             
             self.bot_status_label.setText("Status: Parado")
-            self.bot_status_label.setStyleSheet("color: #f44336;")
+            self.bot_status_label.setPalette(self._bot_status_palettes[False])
             self.start_bot_btn.setEnabled(True)
             self.stop_bot_btn.setEnabled(False)
             
@@ -1222,32 +1703,107 @@ Timestamp: {prediction.get('timestamp', '')}
     
     def navigate_to_url(self):
         """Navega para URL"""
-        url = self.url_input.text()
-        if not url.startswith('http'):
-            url = 'https://' + url
-        self.browser.setUrl(QUrl(url))
+        # fromUserInput detecta esquema/host (inclui IDN); sem esquema assume http(s)
+        url = QUrl.fromUserInput(self.url_input.text().strip())
+        if url.isValid():
+            self._ensure_browser().setUrl(url)
+    
+    def _open_browser_url(self, url, *_):
+        """Abre a URL no navegador (cria o navegador se necessário)"""
+        self._ensure_browser().setUrl(url)
     
     def browser_back(self):
         """Volta no navegador"""
-        self.browser.back()
+        # Sem navegador criado não há histórico: não vale subir o Chromium só para isso
+        if self.browser is not None:
+            self.browser.back()
     
     def browser_forward(self):
         """Avança no navegador"""
-        self.browser.forward()
+        if self.browser is not None:
+            self.browser.forward()
     
     def browser_refresh(self):
         """Atualiza navegador"""
-        self.browser.reload()
+        if self.browser is not None:
+            self.browser.reload()
+    
+    def _ensure_browser(self):
+        """Retorna o navegador, criando-o no lugar do placeholder na primeira chamada"""
+        if self.browser is None:
+            from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEnginePage
+            
+            self.browser = QWebEngineView()
+            self.browser.setPage(QWebEnginePage(self._create_browser_profile(), self.browser))
+            self.browser.urlChanged.connect(self.update_url_bar)
+            self._browser_layout.replaceWidget(self._browser_placeholder, self.browser)
+            self._browser_placeholder.deleteLater()
+            self._browser_placeholder = None
+            # Página inicial só se quem abriu a aba não definiu outra URL em seguida
+            QTimer.singleShot(0, self._load_default_browser_page)
+        return self.browser
+    
+    def _create_browser_profile(self):
+        """
+        Perfil do navegador embutido: cache HTTP em disco (limitado, reaproveitado
+        entre execuções) e recursos que as páginas de trade não usam desligados.
+        Cookies continuam persistentes (logins nas exchanges).
+        """
+        from PyQt5.QtWebEngineWidgets import QWebEngineProfile, QWebEngineSettings
+        
+        profile = QWebEngineProfile("marketanalyzer", self)
+        profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+        profile.setCachePath(BROWSER_CACHE_DIR)
+        profile.setHttpCacheMaximumSize(BROWSER_CACHE_MAX_BYTES)
+        
+        settings = profile.settings()
+        for attr in (
+            QWebEngineSettings.WebGLEnabled,
+            QWebEngineSettings.PluginsEnabled,
+            QWebEngineSettings.AutoLoadIconsForPage,
+            QWebEngineSettings.ScreenCaptureEnabled,
+        ):
+            settings.setAttribute(attr, False)
+        # Sem autoplay de mídia
+        settings.setAttribute(QWebEngineSettings.PlaybackRequiresUserGesture, True)
+        return profile
+    
+    def _prewarm_browser(self, crypto_symbols):
+        """
+        Cria o navegador antes da primeira ordem do bot e abre a página de trade,
+        deixando sessão e bundle JS da exchange no cache. Não navega se o
+        navegador já existe (o usuário pode estar usando).
+        """
+        if self.browser is not None:
+            return
+        browser = self._ensure_browser()
+        if crypto_symbols:
+            url = self.get_trade_url({'symbol': crypto_symbols[0], 'asset_type': ASSET_TYPE_CRYPTO})
+            if url:
+                browser.setUrl(QUrl(url))
+    
+    def _load_default_browser_page(self):
+        """Carrega a página inicial do navegador se nenhuma URL foi definida"""
+        if self.browser is not None and self.browser.url().isEmpty():
+            self.browser.setUrl(QUrl("https://www.tradingview.com"))
     
     def update_url_bar(self, url):
-        """Atualiza barra de URL"""
-        self.url_input.setText(url.toString())
+        """Atualiza barra de URL (rajadas de urlChanged viram uma única atualização)"""
+        self._pending_url = url
+        self._url_bar_timer.start()
+    
+    def _flush_url_bar(self):
+        """Exibe a última URL recebida"""
+        if self._pending_url is not None:
+            self.url_input.setText(self._pending_url.toString())
+            self._pending_url = None
     
     def toggle_time_limit(self, state):
         """Ativa/desativa limite de tempo"""
         self.time_limit_enabled = (state == Qt.Checked)
         if not self.time_limit_enabled:
-            self.time_limit_end = None
+            self._time_limit_deadline_ms = None
+            self.time_limit_timer.stop()
             self.log("Limite de tempo desativado")
     
     def update_time_limit_controls(self):
@@ -1273,7 +1829,7 @@ Timestamp: {prediction.get('timestamp', '')}
                 seconds = self.duration_seconds.value()
                 
                 duration = timedelta(hours=hours, minutes=minutes, seconds=seconds)
-                self.time_limit_end = datetime.now() + duration
+                self._set_time_limit_deadline(duration)
                 
                 self.log(f"Limite de tempo configurado: {hours}h {minutes}m {seconds}s")
                 QMessageBox.information(
@@ -1284,7 +1840,7 @@ Timestamp: {prediction.get('timestamp', '')}
                 
             elif limit_type == 1:  # Horário específico
                 target_datetime = self.specific_datetime.dateTime().toPyDateTime()
-                self.time_limit_end = target_datetime
+                self._set_time_limit_deadline(target_datetime - datetime.now())
                 
                 self.log(f"Limite de tempo configurado: até {target_datetime}")
                 QMessageBox.information(
@@ -1305,55 +1861,75 @@ Timestamp: {prediction.get('timestamp', '')}
                     f"Programa funcionará apenas entre {start_time} e {end_time}"
                 )
             
+            self._schedule_time_limit()
+            
         except Exception as e:
             logger.error(f"Erro ao aplicar limite: {e}")
             QMessageBox.critical(self, "Erro", f"Erro ao aplicar limite: {e}")
     
-    def check_time_limit(self):
-        """Verifica se o limite de tempo foi atingido"""
-        if not self.time_limit_enabled or not self.time_limit_end:
+    def _set_time_limit_deadline(self, duration):
+        """Converte a duração até o limite para um prazo no relógio monotônico"""
+        self._time_limit_deadline_ms = self._elapsed.elapsed() + int(duration.total_seconds() * 1000)
+    
+    def _schedule_time_limit(self):
+        """Agenda um único disparo do timer para o instante do limite"""
+        self.time_limit_timer.stop()
+        if not self.time_limit_enabled or self._time_limit_deadline_ms is None:
+            return
+        ms = self._time_limit_deadline_ms - self._elapsed.elapsed()
+        # QTimer aceita no máximo ~24 dias (int32 ms); prazos maiores são reagendados no disparo
+        self.time_limit_timer.start(min(max(ms, 0), self.MAX_TIMER_MS))
+    
+    def _on_time_limit_hit(self):
+        """Disparo do timer de limite de tempo"""
+        if not self.time_limit_enabled or self._time_limit_deadline_ms is None:
             return
         
-        if datetime.now() >= self.time_limit_end:
-            self.log("Limite de tempo atingido! Encerrando programa...")
-            
-            QMessageBox.information(
-                self,
-                "Limite de Tempo",
-                "O limite de tempo foi atingido. O programa será encerrado."
-            )
-            
-            # Para o bot se estiver rodando
-            if self.trading_bot:
-                self.stop_trading_bot()
-            
-            # Fecha o programa
-            QApplication.quit()
+        if self._elapsed.elapsed() < self._time_limit_deadline_ms:
+            self._schedule_time_limit()
+            return
+        
+        self.log("Limite de tempo atingido! Encerrando programa...")
+        
+        QMessageBox.information(
+            self,
+            "Limite de Tempo",
+            "O limite de tempo foi atingido. O programa será encerrado."
+        )
+        
+        # Para o bot se estiver rodando
+        if self.trading_bot:
+            self.stop_trading_bot()
+        
+        # Fecha o programa
+        QApplication.quit()
     
     def update_time_display(self):
         """Atualiza display de tempo de execução"""
-        elapsed = datetime.now() - self.start_time
-        hours, remainder = divmod(int(elapsed.total_seconds()), 3600)
-        minutes, seconds = divmod(remainder, 60)
-        
-        time_str = f"Tempo de execução: {hours:02d}:{minutes:02d}:{seconds:02d}"
-        
-        if self.time_limit_enabled and self.time_limit_end:
-            remaining = self.time_limit_end - datetime.now()
-            if remaining.total_seconds() > 0:
-                r_hours, r_remainder = divmod(int(remaining.total_seconds()), 3600)
-                r_minutes, r_seconds = divmod(r_remainder, 60)
-                time_str += f" | Tempo restante: {r_hours:02d}:{r_minutes:02d}:{r_seconds:02d}"
-            else:
-                time_str += " | Tempo restante: 00:00:00"
+        elapsed_ms = self._elapsed.elapsed()
+        time_str = f"Tempo de execução: {_format_hms(elapsed_ms // 1000)}"
+        
+        if self.time_limit_enabled and self._time_limit_deadline_ms is not None:
+            remaining_s = max(self._time_limit_deadline_ms - elapsed_ms, 0) // 1000
+            time_str += f" | Tempo restante: {_format_hms(remaining_s)}"
         
         self.time_status_label.setText(time_str)
     
     def log(self, message):
         """Adiciona mensagem ao log"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.log_text.append(f"[{timestamp}] {message}")
-        logger.info(message)
+        self._log_pending.append(f"[{timestamp}] {message}")
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+        # Sem LogRecord quando INFO está desligado (rajadas de log do bot)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%s", message)
+    
+    def _flush_log(self):
+        """Escreve as mensagens pendentes no log com um único append"""
+        if self._log_pending:
+            self.log_text.append("\n".join(self._log_pending))
+            self._log_pending.clear()
     
     def closeEvent(self, event):
         """Evento de fechamento da janela"""
@@ -1366,17 +1942,35 @@ Timestamp: {prediction.get('timestamp', '')}
         self.time_limit_timer.stop()
         self.time_display_timer.stop()
         
+        # Grava alterações de configuração ainda pendentes
+        self._flush_config(wait=True)
+        
+        # Fecha sessões aiohttp/ccxt e o event loop do provedor (após a análise em andamento)
+        self.analysis_pool.waitForDone()
+        if self.data_provider is not None:
+            self.data_provider.close()
+        
         event.accept()
 
 
 def main():
     """Função principal"""
+    # Necessário para importar QtWebEngineWidgets depois de criar o QApplication
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     app.setApplicationName("Market Analyzer")
+    app.setStyleSheet(_APP_QSS)
     
     window = MarketAnalyzerGUI()
     window.show()
     
+    # Fecha a splash screen do PyInstaller (--splash), se houver
+    try:
+        import pyi_splash
+        pyi_splash.close()
+    except ImportError:
+        pass
+    
     sys.exit(app.exec_())
 
 
@@ -142,15 +142,18 @@ class MarketAnalyzer:
         
         return sar
     
-    def populate_indicators(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+    def populate_indicators(self, dataframe: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
         """
         Adiciona indicadores técnicos ao dataframe
         Baseado na estratégia sample_strategy.py do Freqtrade
+        
+        inplace=True grava as colunas no próprio dataframe (sem cópia);
+        use apenas quando o chamador é dono do dataframe.
         """
         if dataframe is None or len(dataframe) == 0:
             return dataframe
         
-        df = dataframe.copy()
+        df = dataframe if inplace else dataframe.copy()
         
         # Momentum Indicators
         # ------------------------------------
@@ -183,6 +183,143 @@ def test_config_manager():
         traceback.print_exc()
         return False
 
+def test_config_migration():
+    """Testa a migração única de credenciais Fernet (legado) para AES-GCM"""
+    print("\n" + "="*60)
+    print("TESTE 4: Migração de credenciais")
+    print("="*60)
+    
+    try:
+        import json
+        import tempfile
+        from pathlib import Path
+        from cryptography.fernet import Fernet
+        from config_manager import ConfigManager
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            # Cria a chave e grava um config.json no formato antigo (Fernet)
+            config_mgr = ConfigManager(tmp)
+            legacy = Fernet(config_mgr._key)
+            config_file = Path(tmp) / 'config.json'
+            config_file.write_text(json.dumps({
+                'exchange_id': 'binance',
+                'api_key': legacy.encrypt(b'legacy_key').decode(),
+                'api_secret': legacy.encrypt(b'legacy_secret').decode(),
+            }))
+            
+            loaded_config = ConfigManager(tmp).load_config()
+            if (loaded_config['api_key'], loaded_config['api_secret']) != ('legacy_key', 'legacy_secret'):
+                print(f"{FAIL} Credenciais legadas não foram lidas")
+                return False
+            print(f"{OK} Credenciais legadas lidas")
+            
+            on_disk = json.loads(config_file.read_text())
+            if not all(on_disk[field].startswith('gcm1:') for field in ('api_key', 'api_secret')):
+                print(f"{FAIL} Arquivo não foi regravado em AES-GCM")
+                return False
+            print(f"{OK} Credenciais regravadas como gcm1:")
+        
+        return True
+        
+    except Exception as e:
+        print(f"{FAIL} Erro no teste: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def test_config_encryption():
+    """Testa a gravação das credenciais em AES-GCM (gcm1:) e a leitura de volta"""
+    print("\n" + "="*60)
+    print("TESTE 5: Criptografia AES-GCM")
+    print("="*60)
+    
+    try:
+        import json
+        import tempfile
+        from pathlib import Path
+        from config_manager import ConfigManager
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            ConfigManager(tmp).save_config({'api_key': 'gcm_key', 'api_secret': 'gcm_secret'})
+            
+            raw = (Path(tmp) / 'config.json').read_text()
+            on_disk = json.loads(raw)
+            if not all(on_disk[field].startswith('gcm1:') for field in ('api_key', 'api_secret')):
+                print(f"{FAIL} Credenciais não gravadas como gcm1:")
+                return False
+            if 'gcm_key' in raw or 'gcm_secret' in raw:
+                print(f"{FAIL} Credenciais em texto plano no arquivo")
+                return False
+            print(f"{OK} Credenciais gravadas como gcm1:")
+            
+            # Instância nova: nada vem do cache em memória
+            loaded_config = ConfigManager(tmp).load_config()
+            if (loaded_config['api_key'], loaded_config['api_secret']) != ('gcm_key', 'gcm_secret'):
+                print(f"{FAIL} Credenciais não descriptografadas")
+                return False
+            print(f"{OK} Credenciais lidas de volta")
+        
+        return True
+        
+    except Exception as e:
+        print(f"{FAIL} Erro no teste: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def test_config_cache_invalidation():
+    """Testa que o cache da configuração é descartado quando o mtime do arquivo muda"""
+    print("\n" + "="*60)
+    print("TESTE 6: Cache da configuração")
+    print("="*60)
+    
+    try:
+        import os
+        import json
+        import tempfile
+        from pathlib import Path
+        from config_manager import ConfigManager
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            config_mgr = ConfigManager(tmp)
+            config_mgr.save_config({'default_timeframe': '5m', 'api_key': 'cache_key'})
+            if config_mgr.load_config()['default_timeframe'] != '5m':
+                print(f"{FAIL} Configuração não carregada")
+                return False
+            
+            # Alteração externa com mtime diferente (sem depender da resolução do relógio)
+            config_file = Path(tmp) / 'config.json'
+            on_disk = json.loads(config_file.read_text())
+            on_disk['default_timeframe'] = '1h'
+            config_file.write_text(json.dumps(on_disk))
+            mtime_ns = config_mgr._cache_mtime + 1_000_000_000
+            os.utime(config_file, ns=(mtime_ns, mtime_ns))
+            
+            loaded_config = config_mgr.load_config()
+            if loaded_config['default_timeframe'] != '1h':
+                print(f"{FAIL} Cache não invalidado após mudança no arquivo")
+                return False
+            if loaded_config['api_key'] != 'cache_key':
+                print(f"{FAIL} Credenciais perdidas ao recarregar")
+                return False
+            print(f"{OK} Cache invalidado pelo mtime")
+            
+            # Sem mudança no arquivo: o cache é reaproveitado (sem reparsear)
+            raw = config_mgr._raw
+            config_mgr.load_config()
+            if config_mgr._raw is not raw:
+                print(f"{FAIL} Arquivo relido sem mudança de mtime")
+                return False
+            print(f"{OK} Cache reaproveitado com mtime igual")
+        
+        return True
+        
+    except Exception as e:
+        print(f"{FAIL} Erro no teste: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
 def main():
     """Função principal"""
     print("\n" + "="*60)
@@ -196,6 +333,9 @@ def main():
     results.append(("Market Analyzer", test_market_analyzer()))
     results.append(("Outra Exchange (Kraken)", test_other_exchange()))
     results.append(("Config Manager", test_config_manager()))
+    results.append(("Migração de credenciais", test_config_migration()))
+    results.append(("Criptografia AES-GCM", test_config_encryption()))
+    results.append(("Cache da configuração", test_config_cache_invalidation()))
     
     # Resumo
     print("\n" + "="*60)